@@ -0,0 +1,98 @@
+"""
+Fingerprint benchmark: sampled fingerprint vs hashing the whole file.
+
+Times input_fingerprint's sampled read (head, middle and tail blocks plus
+size and duration) against a full SHA-256 of the same file, for synthetic
+files of the requested sizes (random data, no FFmpeg needed) or for real
+recordings passed with --input. The synthetic files were just written, so
+they are read from the OS page cache; run --input on recordings that have
+not been opened recently to see cold-disk numbers, where the gap is widest.
+
+Usage:
+    python benchmarks/bench_fingerprint.py
+    python benchmarks/bench_fingerprint.py --sizes 100,1000,5000 --repeat 5
+    python benchmarks/bench_fingerprint.py --input meeting.mp4 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from drop_the_mike_core import _file_sha256, _sampled_fingerprint  # noqa: E402
+
+
+def parse_list(value: str, cast=str) -> list:
+    return [cast(item) for item in value.split(',') if item.strip()]
+
+
+def make_file(path: str, size_mb: int):
+    """Write size_mb MB of random data (8 MB of it, repeated)"""
+    block = os.urandom(8 * 1024 * 1024)
+    remaining = size_mb * 1024 * 1024
+    with open(path, 'wb') as f:
+        while remaining > 0:
+            f.write(block[:remaining])
+            remaining -= len(block)
+
+
+def timed(func, repeat: int) -> float:
+    """Median wall-clock seconds of `repeat` calls"""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def measure(path: str, repeat: int) -> dict:
+    size = os.path.getsize(path)
+    sampled = timed(lambda: _sampled_fingerprint(path, 0.0), repeat)
+    full = timed(lambda: _file_sha256(path), repeat)
+    return {
+        'file': path,
+        'size': size,
+        'sampled_seconds': sampled,
+        'full_seconds': full,
+        'speedup': full / sampled if sampled else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=lambda v: parse_list(v, int), default=[100, 1000],
+                        help='comma-separated synthetic file sizes in MB (default: 100,1000)')
+    parser.add_argument('--input', action='append', help='time this file instead (repeatable)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per file; the median is reported')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    results = []
+    if args.input:
+        results = [measure(path, args.repeat) for path in args.input]
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            for size_mb in args.sizes:
+                path = os.path.join(tmp, f'bench_{size_mb}mb.bin')
+                print(f"Generating {size_mb} MB file...", file=sys.stderr)
+                make_file(path, size_mb)
+                results.append(measure(path, args.repeat))
+                os.remove(path)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    print(f"{'size':>10} {'sampled':>10} {'full hash':>11} {'speedup':>9}")
+    for r in results:
+        print(f"{r['size'] / 1024 / 1024:>8.0f}MB {r['sampled_seconds'] * 1000:>8.2f}ms "
+              f"{r['full_seconds']:>10.3f}s {r['speedup']:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Seek strategy benchmark for split_audio.
+
+Encodes a fixed-length slice at increasing part indices of a long synthetic
+recording and times each FFmpeg run, once with the legacy output-side seek
+(`-i input -ss start`) and once with the fast input-side seek plus accurate
+trim used by split_audio. With output-side seeking the time per part grows
+with the index; with input-side seeking it should stay flat.
+
+Usage:
+    python benchmarks/bench_seek.py
+    python benchmarks/bench_seek.py --duration 7200 --parts 20
+    python benchmarks/bench_seek.py --input meeting.mp3
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from drop_the_mike_core import _seek_args, get_ffmpeg_path  # noqa: E402
+
+SLICE_SECONDS = 10.0
+
+
+def make_input(path: str, duration: float):
+    """Create a synthetic MP3 recording with FFmpeg's lavfi sine source"""
+    subprocess.run([
+        get_ffmpeg_path(), '-v', 'error', '-y',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:sample_rate=44100:duration={duration}',
+        '-b:a', '128k', path
+    ], check=True)
+
+
+def time_part(input_file: str, output_file: str, start: float, strategy: str) -> float:
+    """Encode SLICE_SECONDS starting at `start` and return the wall-clock time"""
+    cmd = [get_ffmpeg_path(), '-v', 'error', '-y']
+    if strategy == 'output':
+        cmd.extend(['-i', input_file, '-ss', str(start), '-t', str(SLICE_SECONDS)])
+    else:
+        input_seek, output_trim = _seek_args(start, SLICE_SECONDS)
+        cmd.extend(input_seek + ['-i', input_file] + output_trim)
+    cmd.extend(['-b:a', '128k', output_file])
+
+    t0 = time.perf_counter()
+    subprocess.run(cmd, check=True, capture_output=True)
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=3600, help='synthetic input length in seconds')
+    parser.add_argument('--parts', type=int, default=20, help='number of parts to sample')
+    parser.add_argument('--input', help='use an existing file instead of a synthetic one')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = args.input
+        duration = args.duration
+        if not input_file:
+            input_file = os.path.join(tmp, 'bench_input.mp3')
+            print(f"Generating {duration:.0f}s synthetic input...")
+            make_input(input_file, duration)
+        elif args.duration == parser.get_default('duration'):
+            from drop_the_mike_core import get_audio_info
+            duration = get_audio_info(input_file)['duration']
+
+        output_file = os.path.join(tmp, 'bench_part.mp3')
+        part_duration = duration / args.parts
+
+        print(f"{'part':>5} {'start':>9} {'output-seek':>12} {'input-seek':>11}")
+        results = {'output': [], 'input': []}
+        for i in range(args.parts):
+            start = i * part_duration
+            row = {}
+            for strategy in ('output', 'input'):
+                row[strategy] = time_part(input_file, output_file, start, strategy)
+                results[strategy].append(row[strategy])
+            print(f"{i + 1:>5} {start:>8.0f}s {row['output']:>11.3f}s {row['input']:>10.3f}s")
+
+        for strategy, label in (('output', 'output-seek'), ('input', 'input-seek')):
+            times = results[strategy]
+            growth = times[-1] / times[0] if times[0] else float('inf')
+            print(f"{label}: total {sum(times):.2f}s, last/first part time ratio {growth:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
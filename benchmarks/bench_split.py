@@ -0,0 +1,244 @@
+"""
+End-to-end benchmark suite for get_audio_info and split_audio.
+
+Generates synthetic inputs with FFmpeg's lavfi sources (MP3, WAV, M4A, FLAC
+and MP4/MKV with a video track) at the requested durations, then times
+get_audio_info (cold and cached) and split_audio for every combination of
+part count, quality mode and split engine. "copy" keeps the original
+quality (bitrate 0, a stream copy for MP3 inputs); "encode" re-encodes at
+128 kbps. Every run starts from an empty private cache, so video inputs
+include their audio extraction and nothing is served from an earlier run.
+
+Results are written as JSON. Pass a saved result file with --baseline to
+flag cases that got slower; the exit code is 1 when any regression is found.
+
+Usage:
+    python benchmarks/bench_split.py --output baseline.json
+    python benchmarks/bench_split.py --baseline baseline.json --output new.json
+    python benchmarks/bench_split.py --formats mp3,mp4 --durations 600,7200 --parts 2,20
+    python benchmarks/bench_split.py --results new.json --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import drop_the_mike_core as core  # noqa: E402
+
+# name -> (extension, FFmpeg output arguments)
+FORMATS = {
+    'mp3': ('.mp3', ['-c:a', 'libmp3lame', '-b:a', '128k']),
+    'wav': ('.wav', ['-c:a', 'pcm_s16le']),
+    'm4a': ('.m4a', ['-c:a', 'aac', '-b:a', '128k']),
+    'flac': ('.flac', ['-c:a', 'flac']),
+    'mp4': ('.mp4', ['-c:v', 'mpeg4', '-q:v', '10', '-c:a', 'aac', '-b:a', '128k']),
+    'mkv': ('.mkv', ['-c:v', 'mpeg4', '-q:v', '10', '-c:a', 'libmp3lame', '-b:a', '128k']),
+}
+MODES = {'copy': 0, 'encode': 128}
+DEFAULT_ENGINES = [engine for engine in core.SPLIT_ENGINES if engine != 'auto']
+
+
+def parse_list(value: str, cast=str) -> list:
+    return [cast(item) for item in value.split(',') if item.strip()]
+
+
+def make_input(path: str, fmt: str, duration: float):
+    """Create a synthetic recording (stereo tone, plus a small test video for video formats)"""
+    ext, codec_args = FORMATS[fmt]
+    cmd = [core.get_ffmpeg_path(), '-v', 'error', '-y',
+           '-f', 'lavfi', '-i', f'sine=frequency=440:sample_rate=44100:duration={duration}']
+    if core.is_video_file(path):
+        cmd.extend(['-f', 'lavfi', '-i', f'testsrc2=size=320x180:rate=10:duration={duration}'])
+    cmd.extend(['-ac', '2'] + codec_args + [path])
+    subprocess.run(cmd, check=True)
+
+
+def isolate_cache(cache_dir: str):
+    """Point the core's probe/audio/silence/result caches at an empty private folder"""
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(cache_dir)
+    core.get_cache_dir = lambda: cache_dir
+    core._probe_cache._entries = None
+    core._silence_cache._entries = None
+    core._fingerprint_cache._entries = None
+    core._content_hash_cache._entries = None
+
+
+def timed(func, repeat: int, setup=None) -> list:
+    """Wall-clock seconds of `repeat` calls to func, running setup before each"""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def result(case_id: str, times: list, **fields) -> dict:
+    entry = {'id': case_id, **fields, 'seconds': statistics.median(times), 'runs': times}
+    if fields.get('duration'):
+        entry['realtime'] = fields['duration'] / entry['seconds'] if entry['seconds'] else None
+    return entry
+
+
+def run_suite(args, work_dir: str) -> list:
+    cache_dir = os.path.join(work_dir, 'cache')
+    results = []
+
+    for fmt in args.formats:
+        for duration in args.durations:
+            input_file = os.path.join(args.inputs_dir or work_dir, f"bench_{int(duration)}s{FORMATS[fmt][0]}")
+            if not os.path.exists(input_file):
+                print(f"Generating {fmt} input ({duration:.0f}s)...", file=sys.stderr)
+                make_input(input_file, fmt, duration)
+
+            # Probe: a cold ffprobe run, then lookups served by the probe cache
+            isolate_cache(cache_dir)
+            cold = timed(lambda: core.get_audio_info(input_file, use_cache=False), args.repeat)
+            core.get_audio_info(input_file)
+            warm = timed(lambda: core.get_audio_info(input_file), args.repeat)
+            base = {'format': fmt, 'duration': duration}
+            results.append(result(f"probe/{fmt}/{int(duration)}s/cold", cold, kind='probe', **base))
+            results.append(result(f"probe/{fmt}/{int(duration)}s/cached", warm, kind='probe', **base))
+            print(f"probe  {fmt:>5} {duration:>7.0f}s  cold {statistics.median(cold):.3f}s  "
+                  f"cached {statistics.median(warm) * 1000:.2f}ms", file=sys.stderr)
+
+            for num_parts in args.parts:
+                for mode in args.modes:
+                    for engine in args.engines:
+                        output_dir = os.path.join(work_dir, 'out')
+
+                        def setup():
+                            isolate_cache(cache_dir)
+                            shutil.rmtree(output_dir, ignore_errors=True)
+
+                        def split():
+                            core.split_audio(input_file, output_dir, num_parts, MODES[mode],
+                                             engine=engine, resume=False)
+
+                        case_id = f"split/{fmt}/{int(duration)}s/{num_parts}p/{mode}/{engine}"
+                        try:
+                            times = timed(split, args.repeat, setup)
+                        except Exception as e:
+                            print(f"split  {case_id}: error: {e}", file=sys.stderr)
+                            results.append({'id': case_id, 'kind': 'split', 'error': str(e)})
+                            continue
+                        entry = result(case_id, times, kind='split', parts=num_parts, mode=mode,
+                                       engine=engine, **base)
+                        results.append(entry)
+                        print(f"split  {case_id:<40} {entry['seconds']:8.3f}s  "
+                              f"{entry['realtime']:7.1f}x realtime", file=sys.stderr)
+
+    shutil.rmtree(os.path.join(work_dir, 'out'), ignore_errors=True)
+    return results
+
+
+def ffmpeg_version() -> str:
+    try:
+        out = subprocess.run([core.get_ffmpeg_path(), '-version'], capture_output=True, text=True)
+        return out.stdout.splitlines()[0]
+    except Exception:
+        return 'unknown'
+
+
+def compare(results: list, baseline: list, threshold: float, min_delta: float) -> list:
+    """Print a comparison against a baseline and return the regressed case ids.
+
+    A case regresses when it is both `threshold` (relative) and `min_delta`
+    seconds (absolute) slower than the baseline; the absolute floor keeps
+    millisecond-scale noise from being reported.
+    """
+    old = {entry['id']: entry for entry in baseline if 'seconds' in entry}
+    regressions = []
+    print(f"{'case':<46} {'baseline':>9} {'current':>9} {'change':>8}")
+    for entry in results:
+        before = old.get(entry['id'])
+        if before is None or 'seconds' not in entry:
+            continue
+        delta = entry['seconds'] - before['seconds']
+        change = delta / before['seconds'] if before['seconds'] else 0.0
+        flag = ''
+        if change > threshold and delta > min_delta:
+            flag = '  REGRESSION'
+            regressions.append(entry['id'])
+        elif change < -threshold and -delta > min_delta:
+            flag = '  faster'
+        print(f"{entry['id']:<46} {before['seconds']:>8.3f}s {entry['seconds']:>8.3f}s {change:>+7.1%}{flag}")
+    print(f"{len(regressions)} regression(s) above {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--formats', type=parse_list, default=list(FORMATS),
+                        help=f"comma-separated input formats (default: {','.join(FORMATS)})")
+    parser.add_argument('--durations', type=lambda v: parse_list(v, float), default=[300, 3600],
+                        help='comma-separated input lengths in seconds (default: 300,3600)')
+    parser.add_argument('--parts', type=lambda v: parse_list(v, int), default=[2, 5, 10, 20],
+                        help='comma-separated part counts (default: 2,5,10,20)')
+    parser.add_argument('--modes', type=parse_list, default=list(MODES),
+                        help='comma-separated quality modes: copy, encode (default: both)')
+    parser.add_argument('--engines', type=parse_list, default=DEFAULT_ENGINES,
+                        help=f"comma-separated split engines (default: {','.join(DEFAULT_ENGINES)})")
+    parser.add_argument('--repeat', type=int, default=1, help='runs per case; the median is reported')
+    parser.add_argument('--inputs-dir', help='keep generated inputs here and reuse them across runs')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--results', help='compare this saved result file instead of running the suite')
+    parser.add_argument('--baseline', help='flag regressions against this saved result file')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative slowdown reported as a regression (default: 0.10)')
+    parser.add_argument('--min-delta', type=float, default=0.05,
+                        help='ignore slowdowns smaller than this many seconds (default: 0.05)')
+    args = parser.parse_args()
+
+    for name, values, known in (('format', args.formats, FORMATS), ('mode', args.modes, MODES),
+                                ('engine', args.engines, core.SPLIT_ENGINES)):
+        unknown = [value for value in values if value not in known]
+        if unknown:
+            parser.error(f"unknown {name}: {', '.join(unknown)}")
+
+    if args.results:
+        with open(args.results, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+    else:
+        if args.inputs_dir:
+            os.makedirs(args.inputs_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory() as work_dir:
+            report = {
+                'meta': {
+                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'ffmpeg': ffmpeg_version(),
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'cpus': os.cpu_count(),
+                    'repeat': args.repeat,
+                },
+                'results': run_suite(args, work_dir),
+            }
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report['results'], baseline['results'], args.threshold, args.min_delta):
+            sys.exit(1)
+    elif not args.output:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
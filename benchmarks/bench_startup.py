@@ -0,0 +1,72 @@
+"""
+Cold start benchmark for the desktop app.
+
+Launches the app repeatedly with DROP_THE_MIKE_STARTUP_REPORT set; the app
+then records when its first frame was drawn and when it became interactive
+(deferred UI built, event loop idle), writes both timestamps and exits.
+Times are measured from just before the process is spawned, so they
+include interpreter start-up and imports. Needs a display (on headless
+Linux, run it under xvfb-run).
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --json
+    python benchmarks/bench_startup.py --exe "dist/DROP THE MIKE.exe"
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_ENV = 'DROP_THE_MIKE_STARTUP_REPORT'
+
+
+def measure(cmd: list, timeout: float) -> dict:
+    """Run the app once and return seconds to first frame and to interactive"""
+    with tempfile.TemporaryDirectory() as tmp:
+        report = os.path.join(tmp, 'startup.json')
+        env = dict(os.environ, **{REPORT_ENV: report})
+        started = time.time()
+        subprocess.run(cmd, env=env, timeout=timeout, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(report, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    return {
+        'first_frame': data['first_frame'] - started,
+        'interactive': data['interactive'] - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='number of launches (default: 5)')
+    parser.add_argument('--exe', help='frozen app to launch instead of drop_the_mike.py')
+    parser.add_argument('--timeout', type=float, default=60, help='seconds to wait for each launch')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    cmd = [args.exe] if args.exe else [sys.executable, os.path.join(ROOT, 'drop_the_mike.py')]
+    runs = []
+    for i in range(args.runs):
+        result = measure(cmd, args.timeout)
+        runs.append(result)
+        if not args.json:
+            print(f"run {i + 1:>2}: first frame {result['first_frame']:.3f}s, "
+                  f"interactive {result['interactive']:.3f}s")
+
+    summary = {key: statistics.median(r[key] for r in runs) for key in ('first_frame', 'interactive')}
+    if args.json:
+        json.dump({'command': cmd, 'runs': runs, 'median': summary}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(f"median: first frame {summary['first_frame']:.3f}s, "
+              f"interactive {summary['interactive']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,26 @@ Design: Green theme inspired by Hebrew Markdown Export
 Bilingual: Hebrew / English
 """
 import customtkinter as ctk
-import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
 import sys
 import subprocess
 import json
 import threading
-import webbrowser
-import shutil
-import urllib.request
+import time
 from typing import Optional, List, Callable
 
+from drop_the_mike_core import (
+    VIDEO_EXTENSIONS, AUDIO_EXTENSIONS,
+    get_script_dir, get_ffmpeg_path, get_ffprobe_path,
+    is_video_file, get_audio_info, format_duration, format_size,
+    default_output_dir, variant_dir_name, BatchScheduler,
+    plan_boundaries, detect_silences, SILENCE_TOLERANCE, compute_waveform, waveform_available,
+    choose_num_parts, effective_bitrate, estimate_size, tracer, get_ffmpeg_capabilities,
+    SplitRequest, JobEngine, EngineJob, OUTPUT_PROFILES, profile_supported, make_concat_input,
+    CancelToken, SplitCancelled, natural_sort_key,
+)
+
 
 # ============================================================================
 # CONSTANTS
@@ -25,9 +33,10 @@ GITHUB_OWNER = "dartaryan"
 GITHUB_REPO = "drop-the-mike"
 MIKE_AGENT_URL = "https://gemini.google.com/gem/124_L6lakUi2fZtfW7ETr38BB-RY2y3t8?usp=sharing"
 GITHUB_URL = "https://github.com/dartaryan"
-
-VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mkv', '.mov', '.webm', '.wmv', '.flv', '.m4v'}
-AUDIO_EXTENSIONS = {'.mp3', '.wav', '.m4a', '.ogg', '.flac', '.aac', '.wma'}
+# Set to a file path to write startup timings there and exit (benchmarks/bench_startup.py)
+STARTUP_REPORT_ENV = "DROP_THE_MIKE_STARTUP_REPORT"
+# Progress bar/label refreshes per second while splitting, however often FFmpeg reports
+PROGRESS_UPDATES_PER_SECOND = 10
 
 
 # ============================================================================
@@ -88,11 +97,36 @@ STRINGS = {
         "he": "לחץ על עיון כדי לבחור קובץ אודיו או וידאו"
     },
     "file_loaded": {"en": "File loaded successfully", "he": "הקובץ נטען בהצלחה"},
+    "files_joined": {
+        "en": "{n} recordings joined into one (in this order)",
+        "he": "{n} הקלטות אוחדו לאחת (בסדר הזה)"
+    },
+    "join_next": {"en": "+ Join Next Recording", "he": "+ צרף הקלטת המשך"},
+    "add_files": {"en": "Add Files to Queue", "he": "הוסף קבצים לתור"},
+    "add_folder": {"en": "Add Folder", "he": "הוסף תיקייה"},
+
+    # Batch queue
+    "batch_title": {"en": "BATCH QUEUE", "he": "תור עיבוד"},
+    "batch_summary": {
+        "en": "{done} of {total} files done  |  {failed} failed  |  {speed}x realtime",
+        "he": "{done} מתוך {total} קבצים הושלמו  |  {failed} נכשלו  |  מהירות x{speed}"
+    },
 
     # Settings
     "settings": {"en": "SETTINGS", "he": "הגדרות"},
     "num_parts": {"en": "Number of Parts", "he": "מספר חלקים"},
+    "split_by": {"en": "Split by", "he": "פיצול לפי"},
+    "mode_parts": {"en": "Parts", "he": "חלקים"},
+    "mode_duration": {"en": "Max length", "he": "אורך מקסימלי"},
+    "mode_size": {"en": "Max size", "he": "גודל מקסימלי"},
+    "limit_minutes": {"en": "Max minutes per part", "he": "מקסימום דקות לחלק"},
+    "limit_mb": {"en": "Max MB per part", "he": "מקסימום MB לחלק"},
+    "planned_parts": {"en": "{n} parts", "he": "{n} חלקים"},
     "quality": {"en": "Output Quality", "he": "איכות פלט"},
+    "also_save_as": {
+        "en": "Also save as (same pass, one subfolder per quality):",
+        "he": "שמור גם באיכויות (באותו מעבר, תיקייה לכל איכות):"
+    },
     "output_folder": {"en": "Output Folder", "he": "תיקיית פלט"},
     "same_as_input": {"en": "Same as input file", "he": "אותה תיקייה כמו קובץ המקור"},
     "change": {"en": "Change", "he": "שנה"},
@@ -104,14 +138,23 @@ STRINGS = {
     "q_medium": {"en": "Medium (192 kbps)", "he": "בינוני (192 kbps)"},
     "q_compact": {"en": "Compact (128 kbps)", "he": "דחוס (128 kbps)"},
     "q_small": {"en": "Small (96 kbps)", "he": "קטן (96 kbps)"},
+    "q_speech": {"en": "Speech (mono 16 kHz, 32 kbps MP3)", "he": "דיבור (מונו 16 kHz, 32 kbps MP3)"},
+    "q_speech_opus": {"en": "Speech (mono 16 kHz, 24 kbps Opus)", "he": "דיבור (מונו 16 kHz, 24 kbps Opus)"},
+    "expected_size": {"en": "Expected total: ~{size}", "he": "גודל צפוי: ~{size}"},
+    "snap_silence": {
+        "en": "Cut at pauses (avoid splitting mid-word)",
+        "he": "חיתוך בהפסקות (בלי לחתוך באמצע מילה)"
+    },
 
     # Preview
     "preview": {"en": "OUTPUT PREVIEW", "he": "תצוגה מקדימה"},
     "preview_hint": {"en": "Select a file to see output preview", "he": "בחר קובץ כדי לראות תצוגה מקדימה"},
+    "analyzing_pauses": {"en": "Finding pauses...", "he": "...מחפש הפסקות"},
 
     # Actions
     "split_file": {"en": "SPLIT FILE", "he": "פצל קובץ"},
     "processing": {"en": "Processing...", "he": "...מעבד"},
+    "cancel": {"en": "Cancel", "he": "ביטול"},
     "clear": {"en": "Clear", "he": "נקה"},
     "open_folder": {"en": "Open Output Folder", "he": "פתח תיקיית פלט"},
 
@@ -140,6 +183,10 @@ STRINGS = {
         "en": "Files saved to:",
         "he": ":הקבצים נשמרו ב"
     },
+    "split_cancelled": {
+        "en": "Cancelled. Finished parts were kept and will be reused next time.",
+        "he": ".בוטל. חלקים שהסתיימו נשמרו וישמשו בפעם הבאה"
+    },
     "split_error": {
         "en": "Failed to split file:",
         "he": ":פיצול הקובץ נכשל"
@@ -222,50 +269,12 @@ class Fonts:
     EMOJI = (FAMILY_SANS, 20, "normal")
 
 
-# ============================================================================
-# FFMPEG UTILITIES
-# ============================================================================
-def get_script_dir() -> str:
-    """Get the directory where this script is located"""
-    if getattr(sys, 'frozen', False):
-        return os.path.dirname(sys.executable)
-    else:
-        return os.path.dirname(os.path.abspath(__file__))
-
-
-def _get_binary_path(name: str) -> str:
-    """Get path to a bundled binary (ffmpeg or ffprobe), cross-platform."""
-    exe = f'{name}.exe' if sys.platform == 'win32' else name
-    script_dir = get_script_dir()
-    locations = [
-        os.path.join(script_dir, exe),
-        os.path.join(script_dir, 'ffmpeg', exe),
-    ]
-    if hasattr(sys, '_MEIPASS'):
-        locations.append(os.path.join(sys._MEIPASS, 'ffmpeg', exe))
-    # Fallback: rely on system PATH
-    locations.append(name)
-    for path in locations:
-        if path and (os.path.exists(path) or path == name):
-            return path
-    return name
-
-
-def get_ffmpeg_path() -> str:
-    """Get FFmpeg path - checks multiple locations (cross-platform)"""
-    return _get_binary_path('ffmpeg')
-
-
-def get_ffprobe_path() -> str:
-    """Get FFprobe path - checks multiple locations (cross-platform)"""
-    return _get_binary_path('ffprobe')
-
-
 # ============================================================================
 # AUTO-UPDATE CHECKER
 # ============================================================================
 def check_for_update() -> Optional[dict]:
     """Check GitHub Releases for a newer version. Returns update info or None."""
+    import urllib.request  # only used by this check, which runs in the background
     try:
         url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/releases/latest"
         req = urllib.request.Request(url, headers={"Accept": "application/vnd.github+json"})
@@ -303,145 +312,10 @@ def check_for_update() -> Optional[dict]:
     return None
 
 
-def is_video_file(file_path: str) -> bool:
-    """Check if a file is a video based on extension"""
-    ext = os.path.splitext(file_path)[1].lower()
-    return ext in VIDEO_EXTENSIONS
-
-
-def get_audio_info(file_path: str) -> dict:
-    """Get audio/video file information using FFprobe"""
-    cmd = [
-        get_ffprobe_path(),
-        '-v', 'error',
-        '-show_entries', 'format=duration,size,bit_rate',
-        '-show_entries', 'stream=codec_name,sample_rate,channels,codec_type',
-        '-of', 'json',
-        file_path
-    ]
-    try:
-        creation_flags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True,
-                                creationflags=creation_flags)
-        data = json.loads(result.stdout)
-
-        format_info = data.get('format', {})
-        # Find the audio stream
-        streams = data.get('streams', [{}])
-        audio_stream = {}
-        for s in streams:
-            if s.get('codec_type') == 'audio':
-                audio_stream = s
-                break
-        if not audio_stream and streams:
-            audio_stream = streams[0]
-
-        duration = float(format_info.get('duration', 0))
-        size = int(format_info.get('size', 0))
-        bitrate = int(format_info.get('bit_rate', 0)) // 1000 if format_info.get('bit_rate') else 0
-
-        return {
-            'duration': duration,
-            'duration_str': format_duration(duration),
-            'size': size,
-            'size_str': format_size(size),
-            'bitrate': bitrate,
-            'codec': audio_stream.get('codec_name', 'unknown'),
-            'sample_rate': audio_stream.get('sample_rate', 'unknown'),
-            'channels': audio_stream.get('channels', 0),
-            'is_video': is_video_file(file_path)
-        }
-    except Exception as e:
-        return {'error': str(e)}
-
-
-def format_duration(seconds: float) -> str:
-    """Format duration in seconds to MM:SS or HH:MM:SS"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    if hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-    return f"{minutes:02d}:{secs:02d}"
-
-
-def format_size(bytes_size: int) -> str:
-    """Format file size in bytes to human readable"""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if bytes_size < 1024:
-            return f"{bytes_size:.1f} {unit}"
-        bytes_size /= 1024
-    return f"{bytes_size:.1f} TB"
-
-
-def split_audio(
-    input_file: str,
-    output_dir: str,
-    num_parts: int,
-    bitrate: int,
-    progress_callback: Optional[Callable[[int, int, str], None]] = None
-) -> List[str]:
-    """Split audio/video file into equal MP3 parts"""
-    info = get_audio_info(input_file)
-    if 'error' in info:
-        raise Exception(f"Failed to read file: {info['error']}")
-
-    total_duration = info['duration']
-    part_duration = total_duration / num_parts
-
-    os.makedirs(output_dir, exist_ok=True)
-    base_name = os.path.splitext(os.path.basename(input_file))[0]
-    is_video = is_video_file(input_file)
-
-    output_files = []
-
-    for i in range(num_parts):
-        if progress_callback:
-            progress_callback(i + 1, num_parts, f"Processing part {i + 1} of {num_parts}...")
-
-        start_time = i * part_duration
-        output_file = os.path.join(output_dir, f"{base_name}_part{i+1}.mp3")
-
-        cmd = [
-            get_ffmpeg_path(),
-            '-i', input_file,
-            '-ss', str(start_time),
-        ]
-
-        if i < num_parts - 1:
-            cmd.extend(['-t', str(part_duration)])
-
-        # Strip video if input is a video file
-        if is_video:
-            cmd.extend(['-vn'])
-
-        input_ext = os.path.splitext(input_file)[1].lower()
-        if bitrate > 0:
-            cmd.extend(['-b:a', f'{bitrate}k'])
-        elif is_video or input_ext != '.mp3':
-            fallback = f"{info['bitrate']}k" if info.get('bitrate') else '192k'
-            cmd.extend(['-b:a', fallback])
-        else:
-            cmd.extend(['-acodec', 'copy'])
-
-        cmd.extend(['-y', output_file])
-
-        try:
-            creation_flags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-            subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                creationflags=creation_flags
-            )
-            output_files.append(output_file)
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"FFmpeg error on part {i+1}: {e.stderr.decode() if e.stderr else str(e)}")
-
-    if progress_callback:
-        progress_callback(num_parts, num_parts, "Complete!")
-
-    return output_files
+def open_url(url: str):
+    """Open a link in the default browser (webbrowser is imported on first click)"""
+    import webbrowser
+    webbrowser.open(url)
 
 
 # ============================================================================
@@ -506,6 +380,8 @@ class DropTheMikeApp(ctk.CTk):
 
         # State
         self.selected_file: Optional[str] = None
+        # Recordings behind selected_file, in order (several when joined)
+        self.selected_files: List[str] = []
         self.output_dir: Optional[str] = None
         self.file_info: dict = {}
         self.is_processing = False
@@ -513,21 +389,84 @@ class DropTheMikeApp(ctk.CTk):
         self._last_output_files: List[str] = []
         self._last_split_parts: int = 3
         self._split_done = False
+        self._batch: Optional[BatchScheduler] = None
+        self._engine: Optional[JobEngine] = None
+        self._job: Optional[EngineJob] = None
+        self._batch_refresh_pending = False
+        self._silences: Optional[list] = None
+        self._waveform: Optional[dict] = None
+        # Stops the background pause/waveform decodes of the loaded file
+        self._analysis_cancel = CancelToken()
+        # Opus speech output is offered once FFmpeg is known to have libopus
+        self._opus_available = False
 
         # Widget registry for i18n updates: list of (widget, string_key, config_key)
         self._i18n_registry: List[tuple] = []
         # Labels that need RTL/LTR alignment updates
         self._directional_labels: List = []
 
+        # Cards that are hidden at startup are built on first use
+        self.batch_card = None
+        self.post_split_frame = None
+        self.footer_frame = None
+        self._update_bar = None
+
         # Build UI
         self._create_ui()
 
         # Center window
         self._center_window()
 
-        # Check for updates in background
-        self._update_bar = None
+        # Footer and update check wait until the window has been drawn
+        self._mapped = False
+        self._first_frame_at: Optional[float] = None
+        self.bind("<Map>", self._on_first_map, add="+")
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_first_map(self, event):
+        """Once the window is mapped, finish startup off the critical path"""
+        if event.widget is not self or self._mapped:
+            return
+        self._mapped = True
+        # Idle callbacks queued now run after Tk has drawn the mapped window
+        self.after_idle(self._finish_startup)
+
+    def _finish_startup(self):
+        """Build deferred UI and start the update check once the first frame is up"""
+        self._first_frame_at = time.time()
+        self._create_footer()
         threading.Thread(target=self._check_update_background, daemon=True).start()
+        # Resolve FFmpeg and its capabilities before the first split needs them
+        threading.Thread(target=self._warm_capabilities, daemon=True).start()
+        self.after_idle(self._report_startup)
+
+    def _warm_capabilities(self):
+        """Probe FFmpeg (worker thread) and offer Opus output if it is supported"""
+        get_ffmpeg_capabilities()
+        if profile_supported('speech_opus'):
+            self.after(0, self._enable_opus)
+
+    def _enable_opus(self):
+        self._opus_available = True
+        self.quality_menu.configure(values=self._get_quality_options())
+
+    def _report_startup(self):
+        """Write startup timings for the startup benchmark, then quit"""
+        path = os.environ.get(STARTUP_REPORT_ENV)
+        if not path:
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f'{{"first_frame": {self._first_frame_at}, "interactive": {time.time()}}}\n')
+        self.after(0, self.destroy)
+
+    def _on_close(self):
+        """Stop running FFmpeg processes (single split and batch) before closing"""
+        if self._engine is not None:
+            self._engine.shutdown()
+        if self._batch is not None:
+            self._batch.shutdown(cancel_running=True)
+        self._analysis_cancel.cancel()
+        self.destroy()
 
     def _center_window(self):
         """Center window on screen"""
@@ -568,7 +507,7 @@ class DropTheMikeApp(ctk.CTk):
             fg_color="#10b981", hover_color="#059669", text_color="#ffffff",
             font=(Fonts.FAMILY_SANS, 11, "bold"), width=120, height=26,
             corner_radius=13,
-            command=lambda: webbrowser.open(info["download_url"])
+            command=lambda: open_url(info["download_url"])
         )
         dl_btn.pack(side="left", padx=4)
 
@@ -635,6 +574,14 @@ class DropTheMikeApp(ctk.CTk):
         quality_options = self._get_quality_options()
         self.quality_menu.configure(values=quality_options)
         self.quality_var.set(quality_options[0])
+        self._on_quality_change(quality_options[0])
+
+        # Update split mode labels, keeping the selected mode
+        mode_options = self._get_split_mode_options()
+        self.split_mode_btn.configure(values=mode_options)
+        self.split_mode_btn.set(mode_options[["parts", "duration", "size"].index(self.split_mode)])
+        self.lbl_limit.configure(
+            text=t("limit_minutes" if self.split_mode != "size" else "limit_mb", self.lang))
 
         # Re-pack directional labels with correct anchor
         for widget in self._directional_labels:
@@ -655,10 +602,52 @@ class DropTheMikeApp(ctk.CTk):
         self.lang = "en" if self.lang == "he" else "he"
         self._refresh_ui()
 
+    def _get_split_mode_options(self) -> list:
+        """Get split mode labels in current language (parts, duration, size)"""
+        return [t(k, self.lang) for k in ["mode_parts", "mode_duration", "mode_size"]]
+
+    def _on_split_mode_change(self, label: str):
+        """Switch between splitting by part count, max duration or max size"""
+        modes = ["parts", "duration", "size"]
+        self.split_mode = modes[self._get_split_mode_options().index(label)]
+        if self.split_mode == "parts":
+            self.limit_frame.pack_forget()
+            self.parts_frame.pack(fill="x", pady=(0, 12), after=self.split_mode_btn)
+        else:
+            self.parts_frame.pack_forget()
+            self.limit_frame.pack(fill="x", pady=(0, 12), after=self.split_mode_btn)
+            self.lbl_limit.configure(
+                text=t("limit_minutes" if self.split_mode == "duration" else "limit_mb", self.lang))
+        self._update_preview()
+
+    def _get_split_limits(self) -> tuple:
+        """(max_part_duration seconds, max_part_size bytes) for the current mode"""
+        if self.split_mode == "parts":
+            return None, None
+        try:
+            value = float(self.limit_var.get())
+        except ValueError:
+            return None, None
+        if value <= 0:
+            return None, None
+        if self.split_mode == "duration":
+            return value * 60, None
+        return None, int(value * 1024 * 1024)
+
+    def _get_variant_keys(self) -> list:
+        """String keys of the standard (stereo MP3) quality presets, best first"""
+        return ["q_original", "q_high", "q_good", "q_medium", "q_compact", "q_small"]
+
+    def _get_quality_keys(self) -> list:
+        """String keys of every quality preset, speech profiles last"""
+        keys = self._get_variant_keys() + ["q_speech"]
+        if self._opus_available:
+            keys.append("q_speech_opus")
+        return keys
+
     def _get_quality_options(self) -> list:
         """Get quality options in current language"""
-        keys = ["q_original", "q_high", "q_good", "q_medium", "q_compact", "q_small"]
-        return [t(k, self.lang) for k in keys]
+        return [t(k, self.lang) for k in self._get_quality_keys()]
 
     def _create_ui(self):
         """Create all UI components"""
@@ -692,11 +681,8 @@ class DropTheMikeApp(ctk.CTk):
         # Progress Section
         self._create_progress()
 
-        # Post-split section (hidden initially)
-        self._create_post_split_section()
-
-        # Footer
-        self._create_footer()
+        # The batch card, post-split section and footer are created later,
+        # when first needed (see _finish_startup)
 
     # ------------------------------------------------------------------
     # HEADER
@@ -804,7 +790,7 @@ class DropTheMikeApp(ctk.CTk):
             anchor=a,
             corner_radius=8,
             height=32,
-            command=lambda: webbrowser.open(MIKE_AGENT_URL)
+            command=lambda: open_url(MIKE_AGENT_URL)
         )
         self.btn_skip_to_mike.pack(anchor=a, fill="x")
         self._register_i18n(self.btn_skip_to_mike, "skip_to_mike")
@@ -817,6 +803,7 @@ class DropTheMikeApp(ctk.CTk):
         """Create file selection card"""
         card = Card(self.scroll_frame)
         card.pack(fill="x", pady=(0, 10))
+        self.file_card = card
 
         accent = ctk.CTkFrame(card, fg_color=Colors.PRIMARY, height=4, corner_radius=0)
         accent.pack(fill="x", side="top")
@@ -858,16 +845,37 @@ class DropTheMikeApp(ctk.CTk):
         self.drop_label.pack(expand=True)
         self._register_i18n(self.drop_label, "browse_hint")
 
-        # Browse button
+        # Browse button + batch queue buttons
+        browse_row = ctk.CTkFrame(inner, fg_color="transparent")
+        browse_row.pack(fill="x", pady=(10, 0))
+
         self.btn_browse = GreenButton(
-            inner,
+            browse_row,
             text=t("browse", self.lang),
             command=self._browse_file,
             width=130
         )
-        self.btn_browse.pack(anchor="e", pady=(10, 0))
+        self.btn_browse.pack(side="right")
         self._register_i18n(self.btn_browse, "browse")
 
+        self.btn_add_files = SecondaryButton(
+            browse_row,
+            text=t("add_files", self.lang),
+            command=self._browse_batch_files,
+            width=150
+        )
+        self.btn_add_files.pack(side="left")
+        self._register_i18n(self.btn_add_files, "add_files")
+
+        self.btn_add_folder = SecondaryButton(
+            browse_row,
+            text=t("add_folder", self.lang),
+            command=self._browse_batch_folder,
+            width=110
+        )
+        self.btn_add_folder.pack(side="left", padx=(8, 0))
+        self._register_i18n(self.btn_add_folder, "add_folder")
+
         # File info (hidden until file loaded)
         self.file_info_frame = ctk.CTkFrame(inner, fg_color="transparent")
         self.file_info_frame.pack(fill="x", pady=(10, 0))
@@ -892,8 +900,77 @@ class DropTheMikeApp(ctk.CTk):
         self.file_details_label.pack(anchor=a, fill="x", pady=(2, 0))
         self._directional_labels.append(self.file_details_label)
 
+        # Continue the recording with more files (Zoom segments, 2 GB phone chunks)
+        self.btn_join = SecondaryButton(
+            self.file_info_frame,
+            text=t("join_next", self.lang),
+            command=self._browse_join_files,
+            width=190,
+            height=30
+        )
+        self.btn_join.pack(anchor=a, pady=(6, 0))
+        self._register_i18n(self.btn_join, "join_next")
+
         self.file_info_frame.pack_forget()
 
+    # ------------------------------------------------------------------
+    # BATCH QUEUE
+    # ------------------------------------------------------------------
+    def _create_batch_card(self):
+        """Create batch queue card (hidden until files are queued)"""
+        self.batch_card = Card(self.scroll_frame)
+        self.batch_card.pack(fill="x", pady=(0, 10))
+
+        accent = ctk.CTkFrame(self.batch_card, fg_color=Colors.PRIMARY, height=4, corner_radius=0)
+        accent.pack(fill="x", side="top")
+
+        inner = ctk.CTkFrame(self.batch_card, fg_color="transparent")
+        inner.pack(fill="x", padx=18, pady=15)
+
+        a = self._anchor
+
+        self.lbl_batch_title = ctk.CTkLabel(
+            inner,
+            text=t("batch_title", self.lang),
+            font=Fonts.HEADER_SMALL,
+            text_color=Colors.PRIMARY,
+            anchor=a
+        )
+        self.lbl_batch_title.pack(anchor=a, fill="x")
+        self._register_i18n(self.lbl_batch_title, "batch_title")
+        self._directional_labels.append(self.lbl_batch_title)
+
+        self.batch_progress_bar = ctk.CTkProgressBar(
+            inner,
+            fg_color=Colors.BORDER,
+            progress_color=Colors.PRIMARY,
+            height=8,
+            corner_radius=4
+        )
+        self.batch_progress_bar.set(0)
+        self.batch_progress_bar.pack(fill="x", pady=(8, 0))
+
+        self.batch_summary_label = ctk.CTkLabel(
+            inner,
+            text="",
+            font=Fonts.BODY_SMALL,
+            text_color=Colors.TEXT_SECONDARY,
+            anchor="w"
+        )
+        self.batch_summary_label.pack(anchor="w", fill="x", pady=(5, 0))
+
+        self.batch_jobs_label = ctk.CTkLabel(
+            inner,
+            text="",
+            font=Fonts.BODY_SMALL,
+            text_color=Colors.TEXT_MUTED,
+            justify="left",
+            anchor="w"
+        )
+        self.batch_jobs_label.pack(anchor="w", fill="x", pady=(5, 0))
+
+        self.batch_card.pack_forget()
+
     # ------------------------------------------------------------------
     # SETTINGS
     # ------------------------------------------------------------------
@@ -924,9 +1001,54 @@ class DropTheMikeApp(ctk.CTk):
         settings_frame = ctk.CTkFrame(inner, fg_color="transparent")
         settings_frame.pack(fill="x", pady=(10, 0))
 
+        # --- Split by: part count / max duration / max size ---
+        self.split_mode = "parts"
+        self.split_mode_btn = ctk.CTkSegmentedButton(
+            settings_frame,
+            values=self._get_split_mode_options(),
+            command=self._on_split_mode_change,
+            fg_color=Colors.BG_ELEVATED,
+            selected_color=Colors.PRIMARY,
+            selected_hover_color=Colors.PRIMARY_HOVER,
+            unselected_color=Colors.BG_ELEVATED,
+            unselected_hover_color=Colors.BTN_SECONDARY_HOVER,
+            text_color=Colors.TEXT_PRIMARY,
+            font=Fonts.BODY
+        )
+        self.split_mode_btn.set(self._get_split_mode_options()[0])
+        self.split_mode_btn.pack(anchor=a, pady=(0, 12))
+
+        # --- Max duration / size (hidden in part-count mode) ---
+        self.limit_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
+        self.limit_frame.pack(fill="x", pady=(0, 12))
+
+        self.lbl_limit = ctk.CTkLabel(
+            self.limit_frame,
+            text=t("limit_minutes", self.lang),
+            font=Fonts.BODY,
+            text_color=Colors.TEXT_PRIMARY
+        )
+        self.lbl_limit.pack(side="left")
+
+        self.limit_var = ctk.StringVar(value="")
+        self.limit_var.trace_add("write", lambda *args: self._update_preview())
+        self.limit_entry = ctk.CTkEntry(
+            self.limit_frame,
+            textvariable=self.limit_var,
+            width=90,
+            height=30,
+            font=Fonts.BODY,
+            fg_color=Colors.BG_INPUT,
+            border_color=Colors.BORDER,
+            text_color=Colors.TEXT_PRIMARY
+        )
+        self.limit_entry.pack(side="right")
+        self.limit_frame.pack_forget()
+
         # --- Number of parts ---
         parts_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
         parts_frame.pack(fill="x", pady=(0, 12))
+        self.parts_frame = parts_frame
 
         parts_label_frame = ctk.CTkFrame(parts_frame, fg_color="transparent")
         parts_label_frame.pack(fill="x")
@@ -985,6 +1107,7 @@ class DropTheMikeApp(ctk.CTk):
             quality_frame,
             variable=self.quality_var,
             values=quality_options,
+            command=self._on_quality_change,
             fg_color=Colors.BG_ELEVATED,
             button_color=Colors.PRIMARY,
             button_hover_color=Colors.DARK_GREEN,
@@ -999,6 +1122,60 @@ class DropTheMikeApp(ctk.CTk):
         )
         self.quality_menu.pack(anchor=a, pady=(5, 0))
 
+        # --- Extra quality variants (written from the same decode) ---
+        self.lbl_variants = ctk.CTkLabel(
+            quality_frame,
+            text=t("also_save_as", self.lang),
+            font=Fonts.BODY_SMALL,
+            text_color=Colors.TEXT_SECONDARY,
+            anchor=a
+        )
+        self.lbl_variants.pack(anchor=a, fill="x", pady=(8, 0))
+        self._register_i18n(self.lbl_variants, "also_save_as")
+        self._directional_labels.append(self.lbl_variants)
+
+        variants_grid = ctk.CTkFrame(quality_frame, fg_color="transparent")
+        variants_grid.pack(anchor=a, pady=(4, 0))
+        self.variant_vars = []
+        self.variant_checks = []
+        for i, key in enumerate(self._get_variant_keys()):
+            var = ctk.BooleanVar(value=False)
+            chk = ctk.CTkCheckBox(
+                variants_grid,
+                text=t(key, self.lang),
+                variable=var,
+                command=self._update_preview,
+                font=Fonts.BODY_SMALL,
+                text_color=Colors.TEXT_PRIMARY,
+                fg_color=Colors.PRIMARY,
+                hover_color=Colors.PRIMARY_HOVER,
+                border_color=Colors.ACCENT,
+                checkbox_width=18,
+                checkbox_height=18,
+                corner_radius=5
+            )
+            chk.grid(row=i // 2, column=i % 2, sticky="w", padx=(0, 12), pady=2)
+            self._register_i18n(chk, key)
+            self.variant_vars.append(var)
+            self.variant_checks.append(chk)
+
+        # --- Cut at pauses ---
+        self.silence_var = ctk.BooleanVar(value=False)
+        self.chk_silence = ctk.CTkCheckBox(
+            settings_frame,
+            text=t("snap_silence", self.lang),
+            variable=self.silence_var,
+            command=self._on_silence_toggle,
+            font=Fonts.BODY,
+            text_color=Colors.TEXT_PRIMARY,
+            fg_color=Colors.PRIMARY,
+            hover_color=Colors.PRIMARY_HOVER,
+            border_color=Colors.ACCENT,
+            corner_radius=6
+        )
+        self.chk_silence.pack(anchor=a, pady=(0, 12))
+        self._register_i18n(self.chk_silence, "snap_silence")
+
         # --- Output folder ---
         output_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
         output_frame.pack(fill="x")
@@ -1065,6 +1242,15 @@ class DropTheMikeApp(ctk.CTk):
         self._register_i18n(self.lbl_preview, "preview")
         self._directional_labels.append(self.lbl_preview)
 
+        # Waveform strip with the planned cuts (shown once an envelope is ready)
+        self.waveform_canvas = ctk.CTkCanvas(
+            inner,
+            height=64,
+            bg=Colors.BG_ELEVATED,
+            highlightthickness=0
+        )
+        self.waveform_canvas.bind("<Configure>", lambda event: self._draw_waveform())
+
         self.preview_content = ctk.CTkLabel(
             inner,
             text=t("preview_hint", self.lang),
@@ -1127,15 +1313,28 @@ class DropTheMikeApp(ctk.CTk):
         self.progress_frame = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
         self.progress_frame.pack(fill="x")
 
+        bar_row = ctk.CTkFrame(self.progress_frame, fg_color="transparent")
+        bar_row.pack(fill="x")
+
+        self.btn_cancel = SecondaryButton(
+            bar_row,
+            text=t("cancel", self.lang),
+            command=self._cancel_split,
+            width=90,
+            height=28
+        )
+        self.btn_cancel.pack(side="right", padx=(10, 0))
+        self._register_i18n(self.btn_cancel, "cancel")
+
         self.progress_bar = ctk.CTkProgressBar(
-            self.progress_frame,
+            bar_row,
             fg_color=Colors.BORDER,
             progress_color=Colors.PRIMARY,
             height=8,
             corner_radius=4
         )
         self.progress_bar.set(0)
-        self.progress_bar.pack(fill="x")
+        self.progress_bar.pack(side="left", fill="x", expand=True)
 
         self.progress_label = ctk.CTkLabel(
             self.progress_frame,
@@ -1221,7 +1420,7 @@ class DropTheMikeApp(ctk.CTk):
         self.btn_open_mike = GreenButton(
             mike_frame,
             text=t("open_mike", self.lang),
-            command=lambda: webbrowser.open(MIKE_AGENT_URL),
+            command=lambda: open_url(MIKE_AGENT_URL),
             width=180,
             height=40
         )
@@ -1291,7 +1490,7 @@ class DropTheMikeApp(ctk.CTk):
             width=60,
             height=24,
             corner_radius=12,
-            command=lambda: webbrowser.open(GITHUB_URL)
+            command=lambda: open_url(GITHUB_URL)
         )
         github_btn.pack(side="left")
 
@@ -1301,13 +1500,17 @@ class DropTheMikeApp(ctk.CTk):
     def _update_instructions(self):
         """Show/hide instructions based on state"""
         if self._split_done:
+            if self.post_split_frame is None:
+                self._create_post_split_section()
             self.instructions_card.pack_forget()
             self.post_split_frame.pack(fill="x", pady=(5, 0))
             # Make sure footer is always at the bottom
-            self.footer_frame.pack_forget()
-            self.footer_frame.pack(fill="x", pady=(15, 5))
+            if self.footer_frame is not None:
+                self.footer_frame.pack_forget()
+                self.footer_frame.pack(fill="x", pady=(15, 5))
         else:
-            self.post_split_frame.pack_forget()
+            if self.post_split_frame is not None:
+                self.post_split_frame.pack_forget()
             # Re-show instructions card if not already visible
             try:
                 self.instructions_card.pack(fill="x", pady=(0, 10),
@@ -1319,8 +1522,8 @@ class DropTheMikeApp(ctk.CTk):
     # EVENT HANDLERS
     # ------------------------------------------------------------------
     def _browse_file(self):
-        """Open file browser for audio/video files"""
-        file_path = filedialog.askopenfilename(
+        """Open file browser for audio/video files (several are joined in numeric-aware name order)"""
+        file_paths = filedialog.askopenfilenames(
             title="Select Audio or Video File",
             filetypes=[
                 ("Media Files", "*.mp3 *.wav *.m4a *.ogg *.flac *.aac *.wma *.mp4 *.avi *.mkv *.mov *.webm *.wmv *.flv *.m4v"),
@@ -1329,19 +1532,42 @@ class DropTheMikeApp(ctk.CTk):
                 ("All Files", "*.*")
             ]
         )
-        if file_path:
-            self._load_file(file_path)
+        if file_paths:
+            self._load_files(sorted(file_paths, key=natural_sort_key))
 
-    def _load_file(self, file_path: str):
-        """Load selected file"""
-        self.selected_file = file_path
-        self.file_info = get_audio_info(file_path)
+    def _browse_join_files(self):
+        """Append recordings to the selected one; they are split as a single timeline"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select the Next Part of the Recording",
+            filetypes=[
+                ("Media Files", "*.mp3 *.wav *.m4a *.ogg *.flac *.aac *.wma *.mp4 *.avi *.mkv *.mov *.webm *.wmv *.flv *.m4v"),
+                ("All Files", "*.*")
+            ]
+        )
+        if file_paths:
+            self._load_files(self.selected_files + sorted(file_paths, key=natural_sort_key))
 
-        if 'error' in self.file_info:
-            messagebox.showerror("Error", f"{t('file_read_error', self.lang)}\n{self.file_info['error']}")
+    def _load_files(self, file_paths: List[str]):
+        """Load an ordered list of recordings as one input (joined by the concat demuxer)"""
+        try:
+            input_file = make_concat_input(file_paths)
+        except Exception as e:
+            messagebox.showerror("Error", f"{t('file_read_error', self.lang)}\n{e}")
             return
+        self._load_file(input_file, file_paths)
+
+    def _load_file(self, file_path: str, file_paths: Optional[List[str]] = None):
+        """Load selected file (or the concat list joining file_paths)"""
+        file_info = get_audio_info(file_path)
 
-        self.file_name_label.configure(text=os.path.basename(file_path))
+        if 'error' in file_info:
+            messagebox.showerror("Error", f"{t('file_read_error', self.lang)}\n{file_info['error']}")
+            return
+        self.selected_file = file_path
+        self.selected_files = list(file_paths or [file_path])
+        self.file_info = file_info
+
+        self.file_name_label.configure(text="  →  ".join(os.path.basename(f) for f in self.selected_files))
         file_type = "Video" if self.file_info.get('is_video') else "Audio"
         details = f"{file_type}  |  Duration: {self.file_info['duration_str']}  |  Size: {self.file_info['size_str']}"
         if self.file_info['bitrate']:
@@ -1349,14 +1575,96 @@ class DropTheMikeApp(ctk.CTk):
         self.file_details_label.configure(text=details)
         self.file_info_frame.pack(fill="x", pady=(10, 0))
 
-        self.drop_label.configure(text=t("file_loaded", self.lang), text_color=Colors.PRIMARY)
+        loaded = t("files_joined", self.lang, n=len(self.selected_files)) if len(self.selected_files) > 1 \
+            else t("file_loaded", self.lang)
+        self.drop_label.configure(text=loaded, text_color=Colors.PRIMARY)
         self.split_btn.configure(state="normal")
+        self._cancel_analysis()
+        self._silences = None
+        if self.silence_var.get():
+            self._start_silence_analysis()
+        self._waveform = None
+        self.waveform_canvas.pack_forget()
+        self._start_waveform()
         self._update_preview()
 
         # Reset split state
         self._split_done = False
         self._update_instructions()
 
+    def _browse_batch_files(self):
+        """Pick several audio/video files and add them to the batch queue"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select Audio or Video Files",
+            filetypes=[
+                ("Media Files", "*.mp3 *.wav *.m4a *.ogg *.flac *.aac *.wma *.mp4 *.avi *.mkv *.mov *.webm *.wmv *.flv *.m4v"),
+                ("All Files", "*.*")
+            ]
+        )
+        if file_paths:
+            self._enqueue_batch(list(file_paths))
+
+    def _browse_batch_folder(self):
+        """Pick a folder and add all of its audio/video files to the batch queue"""
+        folder = filedialog.askdirectory(title="Select Folder")
+        if folder:
+            self._enqueue_batch([folder])
+
+    def _enqueue_batch(self, paths: List[str]):
+        """Queue files/folders with the current settings on the batch scheduler"""
+        if self._batch is None:
+            self._batch = BatchScheduler(on_update=self._on_batch_update)
+        if self.batch_card is None:
+            self._create_batch_card()
+        max_duration, max_size = self._get_split_limits()
+        # Same settings as a single split: with a limit the part count is derived per file
+        num_parts = 1 if max_duration or max_size else int(self.parts_slider.get())
+        bitrate = self._get_bitrate()
+        options = {
+            'max_part_duration': max_duration,
+            'max_part_size': max_size,
+            'silence_tolerance': SILENCE_TOLERANCE if self.silence_var.get() else 0.0,
+            'profile': self._get_profile(),
+        }
+        for path in paths:
+            if os.path.isdir(path):
+                self._batch.add_directory(path, num_parts, bitrate, self.output_dir, **options)
+            else:
+                self._batch.add(path, num_parts, bitrate, self.output_dir, **options)
+        self.batch_card.pack(fill="x", pady=(0, 10), after=self.file_card)
+        self._refresh_batch()
+
+    def _on_batch_update(self, job):
+        """Batch worker callback: schedule at most one pending UI refresh"""
+        if not self._batch_refresh_pending:
+            self._batch_refresh_pending = True
+            self.after(100, self._refresh_batch)
+
+    def _refresh_batch(self):
+        """Show per-file and overall batch progress"""
+        self._batch_refresh_pending = False
+        if self._batch is None:
+            return
+        stats = self._batch.stats()
+        self.batch_progress_bar.set(stats['progress'])
+        self.batch_summary_label.configure(text=t(
+            "batch_summary", self.lang,
+            done=stats['done'], total=stats['total'], failed=stats['error'],
+            speed=f"{stats['speed']:.1f}"
+        ))
+        icons = {'queued': "⏳", 'running': "▶", 'done': "✓", 'error': "✗", 'cancelled': "–"}
+        lines = []
+        for job in self._batch.jobs:
+            line = f"{icons[job.status]}  {os.path.basename(job.input_file)}"
+            if job.status == 'running':
+                line += f"  {int(job.progress * 100)}%"
+            elif job.status == 'done':
+                line += f"  ({len(job.output_files)} parts, {job.elapsed:.0f}s)"
+            elif job.status == 'error':
+                line += f"  {job.error.splitlines()[0][:60] if job.error else ''}"
+            lines.append(line)
+        self.batch_jobs_label.configure(text="\n".join(lines))
+
     def _browse_output(self):
         """Browse for output folder"""
         folder = filedialog.askdirectory(title="Select Output Folder")
@@ -1372,32 +1680,194 @@ class DropTheMikeApp(ctk.CTk):
         self.parts_value_label.configure(text=str(parts))
         self._update_preview()
 
+    def _on_quality_change(self, value: str):
+        """Handle the quality menu; speech profiles have no extra variants"""
+        state = "normal" if self._get_profile(value) == 'standard' else "disabled"
+        for chk in self.variant_checks:
+            chk.configure(state=state)
+        self._update_preview()
+
+    def _on_silence_toggle(self):
+        """Handle the cut-at-pauses checkbox"""
+        if self.silence_var.get() and self.selected_file and self._silences is None:
+            self._start_silence_analysis()
+        self._update_preview()
+
+    def _cancel_analysis(self):
+        """Stop background analysis of the previous file; later runs get a fresh token"""
+        self._analysis_cancel.cancel()
+        self._analysis_cancel = CancelToken()
+
+    def _start_silence_analysis(self):
+        """Find pauses in the selected file in a background thread"""
+        file_path = self.selected_file
+        file_info = dict(self.file_info)
+        cancel = self._analysis_cancel
+
+        def worker():
+            try:
+                silences = detect_silences(file_path, file_info, cancel=cancel)
+            except SplitCancelled:
+                return
+            except Exception:
+                silences = []  # Fall back to equal cuts
+            self.after(0, lambda: self._silence_ready(file_path, silences))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _silence_ready(self, file_path: str, silences: list):
+        """Store analysis results if the file is still selected"""
+        if file_path == self.selected_file:
+            self._silences = silences
+            self._update_preview()
+
+    def _start_waveform(self):
+        """Compute the waveform envelope in a background thread (needs NumPy)"""
+        if not waveform_available():
+            return
+        file_path = self.selected_file
+        file_info = dict(self.file_info)
+        cancel = self._analysis_cancel
+
+        def worker():
+            try:
+                waveform = compute_waveform(file_path, file_info, cancel=cancel)
+            except Exception:
+                return  # The preview simply has no waveform
+            self.after(0, lambda: self._waveform_ready(file_path, waveform))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _waveform_ready(self, file_path: str, waveform: dict):
+        """Show the envelope if the file is still selected"""
+        if file_path != self.selected_file:
+            return
+        self._waveform = waveform
+        self.waveform_canvas.pack(fill="x", pady=(8, 0), before=self.preview_content)
+        self._draw_waveform()
+
+    def _draw_waveform(self):
+        """Draw the peak (light) and RMS (dark) envelopes, one column per pixel"""
+        canvas = self.waveform_canvas
+        canvas.delete("all")
+        if not self._waveform:
+            return
+        width, height = canvas.winfo_width(), int(canvas.cget("height"))
+        peak, rms = self._waveform['peak'], self._waveform['rms']
+        bins = len(peak)
+        mid = height / 2
+        for x in range(max(width, 1)):
+            lo = x * bins // width
+            hi = max(lo + 1, (x + 1) * bins // width)
+            p = max(peak[lo:hi]) * mid
+            r = max(rms[lo:hi]) * mid
+            canvas.create_line(x, mid - p, x, mid + p + 1, fill=Colors.ACCENT)
+            canvas.create_line(x, mid - r, x, mid + r + 1, fill=Colors.PRIMARY)
+        self._draw_cuts(self._plan_preview())
+
+    def _draw_cuts(self, boundaries: Optional[List[float]]):
+        """Redraw only the cut markers on the waveform (cheap, runs on every slider move)"""
+        canvas = self.waveform_canvas
+        canvas.delete("cuts")
+        if not self._waveform or not boundaries or not self._waveform['duration']:
+            return
+        width, height = canvas.winfo_width(), int(canvas.cget("height"))
+        for cut in boundaries[1:-1]:
+            x = cut / self._waveform['duration'] * width
+            canvas.create_line(x, 0, x, height, fill=Colors.DARK_GREEN, width=2, tags="cuts")
+
+    def _plan_preview(self) -> Optional[List[float]]:
+        """Plan boundaries exactly as the split will (None if duration unknown)"""
+        if 'duration' not in self.file_info:
+            return None
+        duration = self.file_info['duration']
+        silences, tolerance = None, 0.0
+        if self.silence_var.get() and self._silences:
+            silences, tolerance = self._silences, SILENCE_TOLERANCE
+
+        max_duration, max_size = self._get_split_limits()
+        if max_duration or max_size:
+            # A size limit applies to the largest variant
+            profile = self._get_profile()
+            kbps = max(effective_bitrate(self.selected_file, self.file_info, b, profile)
+                       for b in self._get_variant_bitrates())
+            num_parts = choose_num_parts(duration, kbps, max_duration, max_size, silences, tolerance)
+        else:
+            num_parts = int(self.parts_slider.get())
+        return plan_boundaries(duration, num_parts, silences, tolerance)
+
     def _update_preview(self):
         """Update output preview"""
         if not self.selected_file:
             self.preview_content.configure(text=t("preview_hint", self.lang))
             return
 
-        num_parts = int(self.parts_slider.get())
         base_name = os.path.splitext(os.path.basename(self.selected_file))[0]
-
-        if 'duration' in self.file_info:
-            part_duration = self.file_info['duration'] / num_parts
-            part_duration_str = format_duration(part_duration)
-        else:
-            part_duration_str = "??:??"
-
-        preview_lines = [f"📁 {base_name}_split/"]
+        boundaries = self._plan_preview()
+        num_parts = len(boundaries) - 1 if boundaries else int(self.parts_slider.get())
+        profile = self._get_profile()
+        ext = OUTPUT_PROFILES[profile]['ext']
+        kbps = effective_bitrate(self.selected_file, self.file_info, self._get_bitrate(), profile)
+
+        preview_lines = [f"📁 {base_name}_split/  ({t('planned_parts', self.lang, n=num_parts)})"]
+        bitrates = self._get_variant_bitrates()
+        if len(bitrates) > 1:
+            preview_lines.append("    📁 " + "  ".join(f"{variant_dir_name(b)}/" for b in bitrates))
         for i in range(min(num_parts, 4)):
-            preview_lines.append(f"    🎵 {base_name}_part{i+1}.mp3  ({part_duration_str})")
+            if boundaries:
+                start, end = boundaries[i], boundaries[i + 1]
+                size = format_size(estimate_size(end - start, kbps))
+                timing = f"{format_duration(start)}–{format_duration(end)}  ({format_duration(end - start)}, ~{size})"
+            else:
+                timing = "(??:??)"
+            preview_lines.append(f"    🎵 {base_name}_part{i+1}{ext}  {timing}")
         if num_parts > 4:
             preview_lines.append(f"    ... +{num_parts - 4} more files")
+        if boundaries:
+            # Every variant holds the whole recording
+            duration = boundaries[-1] - boundaries[0]
+            total = sum(estimate_size(duration, effective_bitrate(self.selected_file, self.file_info, b, profile))
+                        for b in bitrates)
+            preview_lines.append(t("expected_size", self.lang, size=format_size(total)))
+        if self.silence_var.get() and self._silences is None:
+            preview_lines.append(t("analyzing_pauses", self.lang))
 
         self.preview_content.configure(text="\n".join(preview_lines))
-
-    def _get_bitrate(self) -> int:
-        """Get selected bitrate from quality option"""
-        quality = self.quality_var.get()
+        self._draw_cuts(boundaries)
+
+    def _get_variant_bitrates(self) -> List[int]:
+        """Selected quality first, then any extra variants ticked below it"""
+        bitrates = [self._get_bitrate()]
+        if self._get_profile() != 'standard':
+            return bitrates  # Extra variants are standard MP3 only
+        for key, var in zip(self._get_variant_keys(), self.variant_vars):
+            bitrate = self._get_bitrate(t(key, self.lang))
+            if var.get() and bitrate not in bitrates:
+                bitrates.append(bitrate)
+        return bitrates
+
+    def _quality_key(self, quality: Optional[str] = None) -> Optional[str]:
+        """String key of the selected quality option (or of the given option)"""
+        quality = quality or self.quality_var.get()
+        for key in self._get_quality_keys():
+            if t(key, self.lang) == quality:
+                return key
+        return None
+
+    def _get_profile(self, quality: Optional[str] = None) -> str:
+        """Output profile (see OUTPUT_PROFILES) of the selected quality option"""
+        key = self._quality_key(quality)
+        if key == "q_speech":
+            return 'speech'
+        if key == "q_speech_opus":
+            return 'speech_opus'
+        return 'standard'
+
+    def _get_bitrate(self, quality: Optional[str] = None) -> int:
+        """Get selected bitrate from quality option (or from the given option)"""
+        quality = quality or self.quality_var.get()
+        if self._get_profile(quality) != 'standard':
+            return 0  # The profile's own bitrate
         # Match by the bitrate number in the string
         if "320" in quality:
             return 320
@@ -1416,52 +1886,82 @@ class DropTheMikeApp(ctk.CTk):
         if not self.selected_file or self.is_processing:
             return
 
+        max_duration, max_size = self._get_split_limits()
+        # With a duration/size limit the part count is derived from it
+        num_parts = 1 if max_duration or max_size else int(self.parts_slider.get())
+        self._submit_split(num_parts, max_part_duration=max_duration, max_part_size=max_size)
+
+    def _submit_split(self, num_parts: int, **limits):
+        """Snapshot the current settings and hand the split to the job engine.
+
+        Everything the job needs is read here, on the UI thread; the worker
+        never touches a widget.
+        """
+        request = SplitRequest(
+            input_file=self.selected_file,
+            # Create a dedicated subfolder
+            output_dir=default_output_dir(self.selected_file, self.output_dir),
+            num_parts=num_parts,
+            bitrates=tuple(self._get_variant_bitrates()),
+            profile=self._get_profile(),
+            silence_tolerance=SILENCE_TOLERANCE if self.silence_var.get() else 0.0,
+            **limits
+        )
+
         self.is_processing = True
         self.split_btn.configure(state="disabled", text=t("processing", self.lang))
         self.progress_frame.pack(fill="x")
         self.progress_bar.set(0)
         self.progress_label.configure(text="")
+        self.btn_cancel.configure(state="normal")
+
+        if self._engine is None:
+            self._engine = JobEngine(max_updates_per_second=PROGRESS_UPDATES_PER_SECOND)
+        self._job = self._engine.submit(
+            request,
+            on_update=lambda job: self.after(0, tracer.wrap(
+                lambda state=job.snapshot(): self._update_progress(state), 'ui.update_progress')),
+            on_done=lambda job: self.after(0, lambda: self._split_finished(job))
+        )
 
-        thread = threading.Thread(target=self._do_split, daemon=True)
-        thread.start()
-
-    def _do_split(self):
-        """Perform the split operation in a background thread"""
-        try:
-            num_parts = int(self.parts_slider.get())
-            self._last_split_parts = num_parts
-            bitrate = self._get_bitrate()
-            base_dir = self.output_dir or os.path.dirname(self.selected_file)
-
-            # Create a dedicated subfolder
-            base_name = os.path.splitext(os.path.basename(self.selected_file))[0]
-            output_dir = os.path.join(base_dir, f"{base_name}_split")
-
-            def progress_callback(current, total, message):
-                progress = current / total
-                self.after(0, lambda: self._update_progress(progress, message))
-
-            output_files = split_audio(
-                self.selected_file,
-                output_dir,
-                num_parts,
-                bitrate,
-                progress_callback
-            )
+    def _update_progress(self, state: dict):
+        """Show a coalesced progress snapshot from the job engine"""
+        message = state['message']
+        if state['speed'] is not None:
+            message += f"  {int(state['fraction'] * 100)}%  |  {state['speed']:.1f}x"
+            if state['eta'] is not None:
+                message += f"  |  ETA {format_duration(state['eta'])}"
+        self.progress_bar.set(state['fraction'])
+        self.progress_label.configure(text=message)
 
-            self.after(0, lambda: self._split_complete(output_files, output_dir))
+    def _split_finished(self, job: EngineJob):
+        """Route a finished job to the matching handler"""
+        self._job = None
+        if job.status == 'done':
+            self._last_split_parts = len(next(iter(job.result.values())))
+            self._split_complete(job.files, job.request.output_dir)
+        elif job.status == 'cancelled':
+            self._split_cancelled()
+        else:
+            self._split_error(job.error)
 
-        except Exception as e:
-            self.after(0, lambda: self._split_error(str(e)))
+    def _cancel_split(self):
+        """Stop the running split; its FFmpeg processes are killed right away"""
+        if self._job is not None:
+            self._job.cancel()
+        self.btn_cancel.configure(state="disabled")
 
-    def _update_progress(self, progress: float, message: str):
-        """Update progress bar"""
-        self.progress_bar.set(progress)
-        self.progress_label.configure(text=message)
+    def _split_cancelled(self):
+        """Handle a split stopped with the Cancel button"""
+        self.is_processing = False
+        self.split_btn.configure(state="normal", text=t("split_file", self.lang))
+        self.btn_cancel.configure(state="disabled")
+        self.progress_label.configure(text=t("split_cancelled", self.lang))
 
     def _split_complete(self, output_files: List[str], output_dir: str):
         """Handle split completion"""
         self.is_processing = False
+        self.btn_cancel.configure(state="disabled")
         self.split_btn.configure(state="normal", text=t("split_file", self.lang))
         self.progress_bar.set(1)
         self.progress_label.configure(
@@ -1485,6 +1985,7 @@ class DropTheMikeApp(ctk.CTk):
     def _split_error(self, error_message: str):
         """Handle split error"""
         self.is_processing = False
+        self.btn_cancel.configure(state="disabled")
         self.split_btn.configure(state="normal", text=t("split_file", self.lang))
         self.progress_frame.pack_forget()
 
@@ -1525,40 +2026,7 @@ class DropTheMikeApp(ctk.CTk):
         self._update_instructions()
 
         # Start split with new part count
-        self.is_processing = True
-        self.split_btn.configure(state="disabled", text=t("processing", self.lang))
-        self.progress_frame.pack(fill="x")
-        self.progress_bar.set(0)
-        self.progress_label.configure(text="")
-
-        thread = threading.Thread(target=self._do_resplit, daemon=True)
-        thread.start()
-
-    def _do_resplit(self):
-        """Perform re-split in background thread"""
-        try:
-            num_parts = self._last_split_parts
-            bitrate = self._get_bitrate()
-            base_dir = self.output_dir or os.path.dirname(self.selected_file)
-            base_name = os.path.splitext(os.path.basename(self.selected_file))[0]
-            output_dir = os.path.join(base_dir, f"{base_name}_split")
-
-            def progress_callback(current, total, message):
-                progress = current / total
-                self.after(0, lambda: self._update_progress(progress, message))
-
-            output_files = split_audio(
-                self.selected_file,
-                output_dir,
-                num_parts,
-                bitrate,
-                progress_callback
-            )
-
-            self.after(0, lambda: self._split_complete(output_files, output_dir))
-
-        except Exception as e:
-            self.after(0, lambda: self._split_error(str(e)))
+        self._submit_split(new_parts)
 
     def _copy_mike_link(self):
         """Copy Mike agent URL to clipboard"""
@@ -1572,8 +2040,12 @@ class DropTheMikeApp(ctk.CTk):
     def _clear_all(self):
         """Clear all selections and reset state"""
         self.selected_file = None
+        self.selected_files = []
         self.output_dir = None
         self.file_info = {}
+        self._cancel_analysis()
+        self._silences = None
+        self._waveform = None
         self._split_done = False
         self._last_output_files = []
         self._last_output_dir = None
@@ -1585,6 +2057,7 @@ class DropTheMikeApp(ctk.CTk):
         self.file_details_label.configure(text="")
         self.output_path_label.configure(text=t("same_as_input", self.lang), text_color=Colors.TEXT_DISABLED)
         self.preview_content.configure(text=t("preview_hint", self.lang))
+        self.waveform_canvas.pack_forget()
         self.split_btn.configure(state="disabled", text=t("split_file", self.lang))
         self.btn_open_folder.configure(state="disabled")
         self.progress_frame.pack_forget()
@@ -1594,6 +2067,19 @@ class DropTheMikeApp(ctk.CTk):
         self.parts_value_label.configure(text="3")
         quality_options = self._get_quality_options()
         self.quality_var.set(quality_options[0])
+        self._on_quality_change(quality_options[0])
+        self.silence_var.set(False)
+        for var in self.variant_vars:
+            var.set(False)
+        self.limit_var.set("")
+        self.split_mode_btn.set(self._get_split_mode_options()[0])
+        self._on_split_mode_change(self._get_split_mode_options()[0])
+
+        # Drop a finished batch queue; a running one keeps going
+        if self._batch is not None and self._batch.is_idle():
+            self._batch.shutdown()
+            self._batch = None
+            self.batch_card.pack_forget()
 
         self._update_instructions()
 
@@ -0,0 +1,321 @@
+"""
+DROP THE MIKE - Command line interface (headless, no GUI dependencies)
+
+Usage:
+    python drop_the_mike_cli.py split meeting.mp4 --parts 5 --bitrate 128
+    python drop_the_mike_cli.py split *.mp3 --output-dir /data/out --json
+    python drop_the_mike_cli.py split interview.wav --profile speech_opus
+    python drop_the_mike_cli.py split zoom_0.mp4 zoom_1.mp4 zoom_2.mp4 --join --max-minutes 30
+    python drop_the_mike_cli.py batch /recordings --workers 8
+    python drop_the_mike_cli.py watch /recordings/incoming --max-minutes 30
+    python drop_the_mike_cli.py serve --port 8765 --workers 2
+"""
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from drop_the_mike_core import (
+    SPLIT_ENGINES, OUTPUT_PROFILES, BatchScheduler, FolderWatcher, get_audio_info, default_output_dir, split_audio, split_audio_variants,
+    format_duration, tracer, get_ffmpeg_capabilities, make_concat_input, is_concat_list, input_files,
+)
+
+
+# ============================================================================
+# COMMANDS
+# ============================================================================
+def split_options(args: argparse.Namespace) -> dict:
+    """split_audio keyword arguments shared by the split and batch commands"""
+    return {
+        'silence_tolerance': args.snap_to_silence,
+        'max_part_duration': args.max_minutes * 60 if args.max_minutes else None,
+        'max_part_size': int(args.max_mb * 1024 * 1024) if args.max_mb else None,
+        'use_cache': not args.no_cache,
+        'profile': args.profile,
+    }
+
+
+def cmd_split(args: argparse.Namespace) -> int:
+    """Split one or more files; returns the process exit code"""
+    results = []
+    failed = False
+
+    inputs = args.inputs
+    if args.join:
+        try:
+            inputs = [make_concat_input(args.inputs)]
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+    for input_file in inputs:
+        output_dir = default_output_dir(input_file, args.output_dir)
+        result = {'input': input_file, 'output_dir': output_dir}
+        if is_concat_list(input_file):
+            result['inputs'] = input_files(input_file)
+
+        def progress_callback(current, total, message, name=os.path.basename(input_file)):
+            if not args.quiet and not args.json:
+                print(f"[{name}] {message}", file=sys.stderr)
+
+        def detail_callback(detail, name=os.path.basename(input_file)):
+            eta = format_duration(detail['eta']) if detail['eta'] is not None else "--:--"
+            sys.stderr.write(f"\r[{name}] {detail['fraction']:6.1%}  {detail['speed']:5.1f}x  ETA {eta} ")
+            if detail['fraction'] >= 1:
+                sys.stderr.write("\n")
+            sys.stderr.flush()
+
+        show_detail = not args.quiet and not args.json and sys.stderr.isatty()
+
+        try:
+            if args.variant:
+                # Every quality from one decode, each in its own subfolder
+                bitrates = [args.bitrate] + args.variant
+                options = split_options(args)
+                options.pop('use_cache')  # variants are not kept in the result cache
+                variants = split_audio_variants(
+                    input_file,
+                    output_dir,
+                    args.parts,
+                    bitrates,
+                    progress_callback,
+                    engine=args.engine,
+                    workers=args.workers,
+                    detail_callback=detail_callback if show_detail else None,
+                    detail_interval=0.5,
+                    **options
+                )
+                output_files = [f for files in variants.values() for f in files]
+            else:
+                output_files = split_audio(
+                    input_file,
+                    output_dir,
+                    args.parts,
+                    args.bitrate,
+                    progress_callback,
+                    engine=args.engine,
+                    workers=args.workers,
+                    detail_callback=detail_callback if show_detail else None,
+                    detail_interval=0.5,
+                    **split_options(args)
+                )
+            info = get_audio_info(input_file)
+            result.update({'status': 'ok', 'duration': info.get('duration'), 'parts': output_files})
+        except Exception as e:
+            failed = True
+            result.update({'status': 'error', 'error': str(e)})
+            if not args.json:
+                print(f"Error: {input_file}: {e}", file=sys.stderr)
+        results.append(result)
+
+        if result['status'] == 'ok' and not args.json and not args.quiet:
+            for path in result['parts']:
+                print(path)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    return 1 if failed else 0
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    """Split many files and folders through the batch scheduler"""
+    def on_update(job):
+        if args.quiet or args.json or job.status not in ('done', 'error'):
+            return
+        stats = scheduler.stats()
+        outcome = f"{len(job.output_files)} parts" if job.status == 'done' else f"error: {job.error}"
+        print(f"[{stats['done'] + stats['error']}/{stats['total']}] "
+              f"{os.path.basename(job.input_file)}: {outcome} ({job.elapsed:.1f}s)", file=sys.stderr)
+
+    scheduler = BatchScheduler(workers=args.workers, on_update=on_update)
+    for path in args.inputs:
+        if os.path.isdir(path):
+            scheduler.add_directory(path, args.parts, args.bitrate, args.output_dir, args.recursive,
+                                    **split_options(args))
+        else:
+            scheduler.add(path, args.parts, args.bitrate, args.output_dir, **split_options(args))
+    scheduler.wait()
+    scheduler.shutdown()
+
+    stats = scheduler.stats()
+    if args.json:
+        json.dump({'jobs': [job.to_dict() for job in scheduler.jobs], 'stats': stats}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif not args.quiet:
+        print(f"{stats['done']} done, {stats['error']} failed in {stats['elapsed']:.1f}s "
+              f"({stats['speed']:.1f}x realtime, {stats['files_per_minute']:.1f} files/min)", file=sys.stderr)
+    return 1 if stats['error'] else 0
+
+
+def cmd_check(args: argparse.Namespace) -> int:
+    """Show the FFmpeg/FFprobe in use and the features split_audio relies on"""
+    caps = get_ffmpeg_capabilities(refresh=args.refresh)
+    if args.json:
+        json.dump(caps, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 1 if 'error' in caps else 0
+    if 'error' in caps:
+        print(f"Error: {caps['error']}", file=sys.stderr)
+        return 1
+    print(f"ffmpeg   {caps['ffmpeg_version']}  ({caps['ffmpeg']})")
+    print(f"ffprobe  {caps['ffprobe_version']}  ({caps['ffprobe']})")
+    for kind, name, use in (('encoders', 'libmp3lame', 'MP3 encoding'),
+                            ('encoders', 'libopus', 'Opus encoding'),
+                            ('muxers', 'segment', 'single-pass splitting'),
+                            ('filters', 'silencedetect', 'snapping cuts to pauses')):
+        mark = 'yes' if name in caps[kind] else 'no '
+        print(f"  {mark}  {name:<14} {use}")
+    return 0
+
+
+def cmd_watch(args: argparse.Namespace) -> int:
+    """Split new recordings in the watched folders until interrupted"""
+    def on_update(job):
+        if job.status not in ('done', 'error'):
+            return
+        if args.json:
+            print(json.dumps(job.to_dict()), flush=True)
+        elif not args.quiet:
+            outcome = f"{len(job.output_files)} parts" if job.status == 'done' else f"error: {job.error}"
+            print(f"{job.input_file}: {outcome} ({job.elapsed:.1f}s)", file=sys.stderr)
+
+    missing = [folder for folder in args.folders if not os.path.isdir(folder)]
+    if missing:
+        print(f"Error: not a folder: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    watcher = FolderWatcher(
+        args.folders, args.parts, args.bitrate, args.output_dir,
+        recursive=args.recursive, workers=args.workers, settle=args.settle,
+        poll_interval=args.interval, state_path=args.state, on_update=on_update,
+        **split_options(args)
+    )
+    if not args.quiet and not args.json:
+        print(f"Watching {', '.join(watcher.folders)} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    """Run the local HTTP job server until interrupted"""
+    from drop_the_mike_server import serve
+
+    if not args.quiet:
+        print(f"Serving on http://{args.host}:{args.port} ({args.workers or os.cpu_count()} workers)",
+              file=sys.stderr)
+    try:
+        serve(args.host, args.port, args.workers, args.quiet)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='drop-the-mike',
+        description='Split audio & video files into MP3 parts for transcription.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    # Options shared by every command that splits files
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('-n', '--parts', type=int,
+                        help='number of parts; the minimum count with --max-minutes/--max-mb '
+                             '(default: 3, or 1 with a limit)')
+    common.add_argument('--max-minutes', type=float, help='make parts no longer than this many minutes')
+    common.add_argument('--max-mb', type=float, help='make parts no larger than this many MB')
+    common.add_argument('-b', '--bitrate', type=int, default=0,
+                        help='output bitrate in kbps; 0 keeps the original quality (default: 0)')
+    common.add_argument('--profile', choices=list(OUTPUT_PROFILES), default='standard',
+                        help='output profile: speech = mono 16 kHz MP3 (32 kbps), speech_opus = mono '
+                             '16 kHz Opus (24 kbps); both are much smaller and faster (default: standard)')
+    common.add_argument('-o', '--output-dir',
+                        help='folder in which the {name}_split folders are created (default: next to each input)')
+    common.add_argument('--snap-to-silence', type=float, default=0.0, metavar='SECONDS',
+                        help='move each cut to the nearest pause within SECONDS (default: off)')
+    common.add_argument('--no-cache', action='store_true',
+                        help='always encode, even if the same split was made before')
+    common.add_argument('--json', action='store_true', help='print a JSON report to stdout')
+    common.add_argument('-q', '--quiet', action='store_true', help='do not print progress')
+    common.add_argument('--trace', metavar='FILE',
+                        help='record per-stage timings to FILE: JSON lines if it ends in .jsonl, '
+                             'otherwise a Chrome trace-event file')
+
+    split = subparsers.add_parser('split', parents=[common], help='split files into MP3 parts')
+    split.add_argument('inputs', nargs='+', metavar='FILE', help='audio or video files to split')
+    split.add_argument('--engine', choices=SPLIT_ENGINES, default='auto', help='split engine (default: auto)')
+    split.add_argument('--workers', type=int, help='parallel engine worker count (default: CPU count)')
+    split.add_argument('--join', action='store_true',
+                       help='treat the files as one recording, in the order given (no merged file is written)')
+    split.add_argument('--variant', type=int, action='append', metavar='KBPS',
+                       help='also write the parts at this bitrate (0 = original) from the same decode; '
+                            'repeatable, each quality goes to its own subfolder')
+    split.set_defaults(func=cmd_split)
+
+    batch = subparsers.add_parser('batch', parents=[common], help='split many files and folders concurrently')
+    batch.add_argument('inputs', nargs='+', metavar='PATH', help='audio/video files or folders')
+    batch.add_argument('-r', '--recursive', action='store_true', help='include files in subfolders')
+    batch.add_argument('--workers', type=int, help='files processed at the same time (default: CPU count)')
+    batch.set_defaults(func=cmd_batch)
+
+    watch = subparsers.add_parser('watch', parents=[common],
+                                  help='split new recordings as they appear in folders')
+    watch.add_argument('folders', nargs='+', metavar='FOLDER', help='folders to watch')
+    watch.add_argument('-r', '--recursive', action='store_true', help='include files in subfolders')
+    watch.add_argument('--workers', type=int, help='files processed at the same time (default: CPU count)')
+    watch.add_argument('--settle', type=float, default=5.0, metavar='SECONDS',
+                       help='split a file once its size and mtime are unchanged this long (default: 5)')
+    watch.add_argument('--interval', type=float, default=2.0, metavar='SECONDS',
+                       help='seconds between folder scans (default: 2)')
+    watch.add_argument('--state', metavar='FILE',
+                       help='file recording which recordings were already split (default: in the cache folder)')
+    watch.set_defaults(func=cmd_watch)
+
+    check = subparsers.add_parser('check', help='show the FFmpeg build in use and its capabilities')
+    check.add_argument('--refresh', action='store_true', help='re-detect instead of using the cached result')
+    check.add_argument('--json', action='store_true', help='print the full capability report as JSON')
+    check.set_defaults(func=cmd_check)
+
+    serve = subparsers.add_parser('serve', help='accept split jobs over a local HTTP API')
+    serve.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    serve.add_argument('--port', type=int, default=8765, help='port to listen on (default: 8765)')
+    serve.add_argument('--workers', type=int, help='files split at the same time (default: CPU count)')
+    serve.add_argument('-q', '--quiet', action='store_true', help='do not log requests')
+    serve.add_argument('--trace', metavar='FILE', help='record per-stage timings to FILE (see split)')
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if hasattr(args, 'parts'):
+        if args.max_minutes is not None and args.max_minutes <= 0:
+            parser.error("--max-minutes must be greater than 0")
+        if args.max_mb is not None and args.max_mb <= 0:
+            parser.error("--max-mb must be greater than 0")
+        if args.parts is None:
+            args.parts = 1 if args.max_minutes or args.max_mb else 3
+        if args.parts < 1:
+            print("Error: --parts must be at least 1", file=sys.stderr)
+            return 2
+    if getattr(args, 'trace', None):
+        tracer.enable()
+    try:
+        return args.func(args)
+    finally:
+        if getattr(args, 'trace', None):
+            tracer.export(args.trace)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2949 @@
+"""
+DROP THE MIKE - Core: probe, plan and split audio/video files.
+
+Headless library used by the GUI (drop_the_mike.py) and the command line
+(drop_the_mike_cli.py). Must not import any GUI toolkit.
+"""
+import atexit
+import bisect
+import hashlib
+import math
+import os
+import re
+import shutil
+import signal
+import sys
+import subprocess
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Callable, Dict, NamedTuple, Tuple
+
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mkv', '.mov', '.webm', '.wmv', '.flv', '.m4v'}
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.m4a', '.ogg', '.flac', '.aac', '.wma'}
+# FFmpeg concat list: several recordings split as one (see make_concat_input)
+CONCAT_EXTENSION = '.ffconcat'
+# Set to a file path to record a trace of every run, written on exit
+TRACE_ENV = 'DROP_THE_MIKE_TRACE'
+
+
+# ============================================================================
+# TRACING
+# ============================================================================
+class Tracer:
+    """Opt-in recorder of timed spans (probe, binary lookup, FFmpeg runs, callbacks).
+
+    Disabled by default, when span() costs a single attribute check. Each
+    span keeps its name, category, start time, duration, thread and an args
+    dict (command line, bytes in/out, ...) that the traced code can add to
+    through the dict span() yields. Spans are exported as JSON lines or as a
+    Chrome trace-event file (chrome://tracing, Perfetto).
+    """
+    def __init__(self):
+        self.enabled = False
+        self.spans: List[dict] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._epoch = time.time()
+
+    def enable(self):
+        self.enabled = True
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+
+    @contextmanager
+    def span(self, name: str, category: str = 'core', **args):
+        if not self.enabled:
+            yield args
+            return
+        start = time.perf_counter()
+        try:
+            yield args
+        except BaseException as e:
+            args['error'] = str(e) or type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            record = {
+                'name': name,
+                'cat': category,
+                'start': start - self._origin,
+                'dur': end - start,
+                'tid': threading.get_ident(),
+                'thread': threading.current_thread().name,
+                'args': args,
+            }
+            with self._lock:
+                self.spans.append(record)
+
+    def wrap(self, func: Optional[Callable], name: str, category: str = 'ui') -> Optional[Callable]:
+        """Record every call of a callback as a span (returned as-is when disabled)"""
+        if func is None or not self.enabled:
+            return func
+
+        def traced(*args, **kwargs):
+            with self.span(name, category):
+                return func(*args, **kwargs)
+        return traced
+
+    def export_jsonl(self, path: str):
+        """One JSON object per span, with wall-clock start times"""
+        with self._lock:
+            spans = list(self.spans)
+        with open(path, 'w', encoding='utf-8') as f:
+            for s in spans:
+                record = dict(s, ts=self._epoch + s['start'], pid=os.getpid())
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def export_chrome(self, path: str):
+        """Chrome trace-event format: complete ('X') events in microseconds"""
+        with self._lock:
+            spans = list(self.spans)
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in {s['tid']: s['thread'] for s in spans}.items()]
+        events.extend({
+            'name': s['name'], 'cat': s['cat'], 'ph': 'X', 'pid': pid, 'tid': s['tid'],
+            'ts': round(s['start'] * 1e6, 3), 'dur': round(s['dur'] * 1e6, 3), 'args': s['args'],
+        } for s in spans)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, default=str)
+
+    def export(self, path: str):
+        """Export by extension: '.jsonl' writes JSON lines, anything else a Chrome trace"""
+        if path.lower().endswith('.jsonl'):
+            self.export_jsonl(path)
+        else:
+            self.export_chrome(path)
+
+
+tracer = Tracer()
+if os.environ.get(TRACE_ENV):
+    tracer.enable()
+    atexit.register(tracer.export, os.environ[TRACE_ENV])
+
+
+def _trace_ffmpeg_io(span: dict, cmd: List[str], outputs: Optional[List[str]] = None):
+    """Add the command line and input/output sizes of an FFmpeg run to a span"""
+    if not tracer.enabled:
+        return
+    span['cmd'] = cmd
+    span['bytes_in'] = sum(os.path.getsize(cmd[i + 1]) for i, a in enumerate(cmd[:-1])
+                           if a == '-i' and os.path.isfile(cmd[i + 1]))
+    outputs = outputs or [cmd[-1]]
+    span['bytes_out'] = sum(os.path.getsize(p) for p in outputs if os.path.isfile(p))
+
+
+# ============================================================================
+# PROCESS RUNNER
+# ============================================================================
+# Lines of stderr kept (ring buffer) for error messages
+STDERR_TAIL_LINES = 40
+# Limits for short metadata calls (ffprobe, capability listings)
+PROBE_TIMEOUT = 60.0
+# An FFmpeg run that prints nothing on stdout or stderr this long is stuck
+STALL_TIMEOUT = 120.0
+
+
+class SplitCancelled(Exception):
+    """Raised by work stopped through a CancelToken"""
+
+
+class CancelToken:
+    """Cancels running FFmpeg/FFprobe processes from another thread.
+
+    Processes started by run_process with this token are killed (with their
+    process tree) as soon as cancel() is called, and run_process raises
+    SplitCancelled. child() tokens are cancelled along with their parent,
+    which lets an engine stop its own workers without cancelling the job.
+    """
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._procs = set()
+        self._children: List['CancelToken'] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            self._event.set()
+            procs, children = list(self._procs), list(self._children)
+        for proc in procs:
+            _kill_tree(proc)
+        for child in children:
+            child.cancel()
+
+    def child(self) -> 'CancelToken':
+        token = CancelToken()
+        with self._lock:
+            self._children.append(token)
+            cancelled = self.cancelled
+        if cancelled:
+            token.cancel()
+        return token
+
+    def _register(self, proc: subprocess.Popen):
+        with self._lock:
+            self._procs.add(proc)
+            cancelled = self.cancelled
+        if cancelled:
+            _kill_tree(proc)
+
+    def _unregister(self, proc: subprocess.Popen):
+        with self._lock:
+            self._procs.discard(proc)
+
+
+def _kill_tree(proc: subprocess.Popen):
+    """Kill a process and everything it started"""
+    if proc.poll() is not None:
+        return
+    try:
+        if sys.platform == 'win32':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(proc.pid)], capture_output=True,
+                           creationflags=subprocess.CREATE_NO_WINDOW)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)  # started in its own session
+    except OSError:
+        pass
+    try:
+        proc.kill()
+    except OSError:
+        pass
+
+
+class ProcessResult:
+    """Outcome of run_process: exit code, captured stdout and the stderr tail"""
+    def __init__(self, returncode: int, stdout: bytes, stderr_tail: str):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr_tail = stderr_tail
+
+
+def run_process(
+    cmd: List[str],
+    error_prefix: str = "Process error",
+    on_stdout: Optional[Callable[[bytes], None]] = None,
+    chunk_size: Optional[int] = None,
+    on_stderr: Optional[Callable[[str], None]] = None,
+    capture_stdout: bool = False,
+    timeout: Optional[float] = None,
+    stall_timeout: Optional[float] = None,
+    cancel: Optional[CancelToken] = None,
+    span: Optional[dict] = None
+) -> ProcessResult:
+    """Run FFmpeg/FFprobe with bounded memory, time limits and cancellation.
+
+    stdout is handed to on_stdout line by line (or in chunk_size blocks) as
+    it arrives, or collected when capture_stdout is set. stderr is read
+    continuously by a helper thread: each line goes to on_stderr and only
+    the last STDERR_TAIL_LINES are kept for the error message. A watchdog
+    kills the process tree when `timeout` is exceeded, when neither stream
+    has produced output for `stall_timeout` seconds, or when `cancel` is
+    triggered. Raises SplitCancelled on cancellation and Exception (with
+    the stderr tail) on any other failure. `span` receives spawn and
+    first-output times for tracing.
+    """
+    piped = on_stdout is not None or capture_stdout
+    kwargs = {'creationflags': subprocess.CREATE_NO_WINDOW} if sys.platform == 'win32' \
+        else {'start_new_session': True}
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL,
+                            stdout=subprocess.PIPE if piped else subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, **kwargs)
+    if span is not None:
+        span['spawn'] = time.perf_counter() - started
+    if cancel:
+        cancel._register(proc)
+
+    tail = deque(maxlen=STDERR_TAIL_LINES)
+    last_output = [time.monotonic()]
+    killed = []  # reason, set by the watchdog
+    done = threading.Event()
+
+    def read_stderr():
+        pending = b''
+        while True:
+            data = proc.stderr.read1(65536)
+            if not data:
+                break
+            last_output[0] = time.monotonic()
+            # FFmpeg ends status lines with '\r'; treat both as line breaks
+            *lines, pending = (pending + data).replace(b'\r', b'\n').split(b'\n')
+            for raw in lines:
+                line = raw.decode(errors='replace').rstrip()
+                if line:
+                    tail.append(line)
+                    if on_stderr:
+                        on_stderr(line)
+        if pending.strip():
+            tail.append(pending.decode(errors='replace').rstrip())
+            if on_stderr:
+                on_stderr(tail[-1])
+
+    def watchdog():
+        deadline = time.monotonic() + timeout if timeout else None
+        while not done.wait(0.5):
+            now = time.monotonic()
+            if deadline and now > deadline:
+                killed.append(f"timed out after {timeout:.0f}s")
+            elif stall_timeout and now - last_output[0] > stall_timeout:
+                killed.append(f"no output for {stall_timeout:.0f}s, stopped")
+            else:
+                continue
+            _kill_tree(proc)
+            return
+
+    stderr_thread = threading.Thread(target=read_stderr, daemon=True)
+    stderr_thread.start()
+    if timeout or stall_timeout:
+        threading.Thread(target=watchdog, daemon=True).start()
+
+    captured = []
+    try:
+        if piped:
+            reader = (lambda: proc.stdout.read(chunk_size)) if chunk_size else proc.stdout.readline
+            for data in iter(reader, b''):
+                last_output[0] = time.monotonic()
+                if span is not None and 'first_output' not in span:
+                    span['first_output'] = time.perf_counter() - started
+                if capture_stdout:
+                    captured.append(data)
+                if on_stdout:
+                    on_stdout(data)
+            proc.stdout.close()
+        returncode = proc.wait()
+        stderr_thread.join()
+    finally:
+        done.set()
+        if proc.poll() is None:
+            _kill_tree(proc)  # the caller raised (or was interrupted) mid-run
+            proc.wait()
+        if cancel:
+            cancel._unregister(proc)
+
+    if cancel and cancel.cancelled:
+        raise SplitCancelled("Cancelled")
+    stderr = "\n".join(tail)
+    if killed:
+        raise Exception(f"{error_prefix}: {killed[0]}\n{stderr}".strip())
+    if returncode != 0:
+        raise Exception(f"{error_prefix}: {stderr or returncode}")
+    return ProcessResult(returncode, b''.join(captured), stderr)
+
+
+# ============================================================================
+# FFMPEG UTILITIES
+# ============================================================================
+def get_script_dir() -> str:
+    """Get the directory where this script is located"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    else:
+        return os.path.dirname(os.path.abspath(__file__))
+
+
+def get_cache_dir() -> str:
+    """Get the per-user cache directory (created on demand), cross-platform"""
+    if sys.platform == 'win32':
+        root = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        path = os.path.join(root, 'DropTheMike', 'Cache')
+    elif sys.platform == 'darwin':
+        path = os.path.expanduser('~/Library/Caches/DropTheMike')
+    else:
+        root = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+        path = os.path.join(root, 'drop-the-mike')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class DiskCache:
+    """Small JSON-backed key/value store with LRU eviction, shared across sessions.
+
+    Entries are kept in memory in least-recently-used order and written back
+    atomically whenever an entry is added; recency from lookups is persisted
+    with the next write. Any read/write problem degrades to an empty (or
+    memory-only) cache rather than failing the caller.
+    """
+    def __init__(self, filename: str, max_entries: int = 256):
+        self.filename = filename
+        self.max_entries = max_entries
+        self._entries: Optional[OrderedDict] = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        return os.path.join(get_cache_dir(), self.filename)
+
+    def _load(self) -> OrderedDict:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = OrderedDict(json.load(f))
+            except Exception:
+                self._entries = OrderedDict()
+        return self._entries
+
+    def _save(self):
+        try:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._entries.items()), f)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            pass
+
+    def get(self, key: str):
+        with self._lock:
+            entries = self._load()
+            if key not in entries:
+                return None
+            entries.move_to_end(key)
+            return entries[key]
+
+    def put(self, key: str, value):
+        with self._lock:
+            entries = self._load()
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()
+            self._save()
+
+
+_binary_paths: dict = {}
+
+
+def _get_binary_path(name: str) -> str:
+    """Get path to a bundled binary (ffmpeg or ffprobe), cross-platform.
+
+    The candidate locations are searched once per process; later calls
+    return the remembered path.
+    """
+    path = _binary_paths.get(name)
+    if path is None:
+        path = _binary_paths[name] = _find_binary(name)
+    return path
+
+
+def _find_binary(name: str) -> str:
+    exe = f'{name}.exe' if sys.platform == 'win32' else name
+    script_dir = get_script_dir()
+    locations = [
+        os.path.join(script_dir, exe),
+        os.path.join(script_dir, 'ffmpeg', exe),
+    ]
+    if hasattr(sys, '_MEIPASS'):
+        locations.append(os.path.join(sys._MEIPASS, 'ffmpeg', exe))
+    # Fallback: rely on system PATH
+    locations.append(name)
+    with tracer.span('find_binary', binary=name) as span:
+        found = next((path for path in locations
+                      if path and (os.path.exists(path) or path == name)), name)
+        span['path'] = found
+    return found
+
+
+def get_ffmpeg_path() -> str:
+    """Get FFmpeg path - checks multiple locations (cross-platform)"""
+    return _get_binary_path('ffmpeg')
+
+
+def get_ffprobe_path() -> str:
+    """Get FFprobe path - checks multiple locations (cross-platform)"""
+    return _get_binary_path('ffprobe')
+
+
+# Capability listings of an FFmpeg build, keyed on binary path, size and mtime
+_capability_cache = DiskCache('ffmpeg_capabilities.json', max_entries=8)
+_capabilities: Optional[dict] = None
+_capabilities_lock = threading.Lock()
+# "<flags> <name>" rows of `ffmpeg -encoders/-muxers/-filters`
+_CAPABILITY_RE = re.compile(r'^\s*[A-Z.|]{1,7}\s+([\w,-]+)\s', re.MULTILINE)
+
+
+def _binary_key(path: str) -> Optional[str]:
+    """Fingerprint of an executable (resolved on PATH if needed): path, size, mtime"""
+    full = path if os.path.isfile(path) else shutil.which(path)
+    if not full:
+        return None
+    st = os.stat(full)
+    return f"{os.path.abspath(full)}|{st.st_size}|{st.st_mtime_ns}"
+
+
+def _ffmpeg_output(binary: str, *args: str) -> str:
+    result = run_process([binary, '-hide_banner'] + list(args), f"{binary} {' '.join(args)} error",
+                         capture_stdout=True, timeout=PROBE_TIMEOUT)
+    return result.stdout.decode(errors='replace')
+
+
+def _detect_capabilities(ffmpeg: str, ffprobe: str) -> dict:
+    """Run the FFmpeg listings once (uncached)"""
+    def version(binary: str) -> str:
+        first = _ffmpeg_output(binary, '-version').split('\n', 1)[0].split()
+        return first[2] if len(first) > 2 else ''
+
+    def names(listing: str) -> List[str]:
+        found = set()
+        for match in _CAPABILITY_RE.findall(_ffmpeg_output(ffmpeg, listing)):
+            found.update(match.split(','))
+        return sorted(found)
+
+    with tracer.span('detect_capabilities', 'process'):
+        caps = {
+            'ffmpeg': ffmpeg,
+            'ffmpeg_version': version(ffmpeg),
+            'ffprobe': ffprobe,
+            'ffprobe_version': version(ffprobe),
+            'encoders': names('-encoders'),
+            'muxers': names('-muxers'),
+            'filters': names('-filters'),
+        }
+    if not caps['encoders'] or not caps['muxers']:
+        raise Exception(f"Could not list the capabilities of {ffmpeg}")
+    return caps
+
+
+def get_ffmpeg_capabilities(refresh: bool = False) -> dict:
+    """Paths, versions and encoders/muxers/filters of the FFmpeg in use.
+
+    Detected once and persisted in the cache keyed on both binaries' size
+    and mtime, so an upgraded FFmpeg is re-examined automatically. Returns
+    a dict with an 'error' key (and empty lists) when FFmpeg cannot be run.
+    """
+    global _capabilities
+    with _capabilities_lock:
+        if _capabilities is not None and not refresh:
+            return _capabilities
+        ffmpeg, ffprobe = get_ffmpeg_path(), get_ffprobe_path()
+        ffmpeg_key, ffprobe_key = _binary_key(ffmpeg), _binary_key(ffprobe)
+        key = f"{ffmpeg_key}||{ffprobe_key}" if ffmpeg_key and ffprobe_key else None
+        caps = _capability_cache.get(key) if key and not refresh else None
+        if caps is None:
+            try:
+                caps = _detect_capabilities(ffmpeg, ffprobe)
+                if key:
+                    _capability_cache.put(key, caps)
+            except Exception as e:
+                caps = {'ffmpeg': ffmpeg, 'ffprobe': ffprobe, 'error': str(e),
+                        'encoders': [], 'muxers': [], 'filters': []}
+        _capabilities = caps
+        return caps
+
+
+def ffmpeg_supports(kind: str, name: str) -> bool:
+    """Whether the FFmpeg build has an encoder, muxer or filter ('encoders',
+    'muxers', 'filters'). Unknown (detection failed) counts as supported, so
+    callers fall back to simply trying.
+    """
+    caps = get_ffmpeg_capabilities()
+    return 'error' in caps or name in caps[kind]
+
+
+# ============================================================================
+# MEDIA INFO
+# ============================================================================
+def is_video_file(file_path: str) -> bool:
+    """Check if a file is a video based on extension"""
+    ext = os.path.splitext(file_path)[1].lower()
+    return ext in VIDEO_EXTENSIONS
+
+
+_probe_cache = DiskCache('probe_cache.json', max_entries=512)
+
+
+def _file_cache_key(file_path: str) -> Optional[str]:
+    """Identity of a file for caching: absolute path, size and mtime.
+
+    A concat list is identified by its member files, so editing or
+    replacing any recording in it invalidates everything cached for it.
+    """
+    if is_concat_list(file_path):
+        try:
+            keys = [_file_cache_key(f) for f in concat_members(file_path)]
+        except OSError:
+            return None
+        return None if None in keys else "concat|" + "|".join(keys)
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}"
+
+
+def get_audio_info(file_path: str, use_cache: bool = True) -> dict:
+    """Get audio/video file information using FFprobe.
+
+    Results are memoized on disk keyed on path, size and mtime, so loading,
+    splitting and re-splitting the same file probes it only once.
+    """
+    with tracer.span('get_audio_info', file=file_path) as span:
+        key = _file_cache_key(file_path) if use_cache else None
+        if key:
+            cached = _probe_cache.get(key)
+            if cached is not None:
+                span.update(cached=True, bytes_in=cached.get('size'))
+                return dict(cached)
+
+        info = _probe_audio_info(file_path)
+        span.update(cached=False, bytes_in=info.get('size'))
+        if key and 'error' not in info:
+            _probe_cache.put(key, info)
+        return info
+
+
+def _probe_audio_info(file_path: str) -> dict:
+    """Run FFprobe on a file (uncached)"""
+    if is_concat_list(file_path):
+        return _probe_concat_info(file_path)
+    cmd = [
+        get_ffprobe_path(),
+        '-v', 'error',
+        '-show_entries', 'format=duration,size,bit_rate',
+        '-show_entries', 'stream=codec_name,sample_rate,channels,codec_type',
+        '-of', 'json',
+        file_path
+    ]
+    try:
+        with tracer.span('ffprobe', 'process', cmd=cmd) as span:
+            result = run_process(cmd, "FFprobe error", capture_stdout=True,
+                                 timeout=PROBE_TIMEOUT, span=span)
+        data = json.loads(result.stdout)
+
+        format_info = data.get('format', {})
+        # Find the audio stream
+        streams = data.get('streams', [{}])
+        audio_stream = {}
+        for s in streams:
+            if s.get('codec_type') == 'audio':
+                audio_stream = s
+                break
+        if not audio_stream and streams:
+            audio_stream = streams[0]
+
+        duration = float(format_info.get('duration', 0))
+        size = int(format_info.get('size', 0))
+        bitrate = int(format_info.get('bit_rate', 0)) // 1000 if format_info.get('bit_rate') else 0
+
+        return {
+            'duration': duration,
+            'duration_str': format_duration(duration),
+            'size': size,
+            'size_str': format_size(size),
+            'bitrate': bitrate,
+            'codec': audio_stream.get('codec_name', 'unknown'),
+            'sample_rate': audio_stream.get('sample_rate', 'unknown'),
+            'channels': audio_stream.get('channels', 0),
+            'is_video': is_video_file(file_path)
+        }
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def format_duration(seconds: float) -> str:
+    """Format duration in seconds to MM:SS or HH:MM:SS"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    if hours > 0:
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def format_size(bytes_size: int) -> str:
+    """Format file size in bytes to human readable"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if bytes_size < 1024:
+            return f"{bytes_size:.1f} {unit}"
+        bytes_size /= 1024
+    return f"{bytes_size:.1f} TB"
+
+
+# ============================================================================
+# JOINED RECORDINGS (concat lists)
+# ============================================================================
+# A recording kept as several files (Zoom segments, phone recordings cut at
+# 2 GB) is split as one timeline through FFmpeg's concat demuxer. The list
+# file names the members in order; the demuxer reads their packets back to
+# back, so the join itself never decodes, re-encodes or writes merged audio.
+
+def is_concat_list(file_path: str) -> bool:
+    """Check if a path is a concat list (by extension)"""
+    return os.path.splitext(file_path)[1].lower() == CONCAT_EXTENSION
+
+
+def _concat_quote(path: str) -> str:
+    return "'" + path.replace("'", "'\\''") + "'"
+
+
+def _concat_unquote(value: str) -> str:
+    """Undo concat-list quoting: '...' is literal, a backslash escapes one character"""
+    out, i, quoted = [], 0, False
+    while i < len(value):
+        ch = value[i]
+        if ch == "'":
+            quoted = not quoted
+        elif ch == '\\' and not quoted and i + 1 < len(value):
+            i += 1
+            out.append(value[i])
+        else:
+            out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def concat_members(list_file: str) -> List[str]:
+    """Absolute paths of the recordings in a concat list, in order"""
+    base_dir = os.path.dirname(os.path.abspath(list_file))
+    members = []
+    with open(list_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('file '):
+                path = _concat_unquote(line[5:].strip())
+                members.append(os.path.normpath(os.path.join(base_dir, path)))
+    return members
+
+
+def input_files(input_file: str) -> List[str]:
+    """The recordings behind an input: the members of a concat list, else the file itself"""
+    return concat_members(input_file) if is_concat_list(input_file) else [input_file]
+
+
+def _input_args(input_file: str) -> List[str]:
+    """FFmpeg arguments that open an input (concat lists need the concat demuxer)"""
+    if is_concat_list(input_file):
+        # Members are absolute paths, which the demuxer only allows with -safe 0
+        return ['-f', 'concat', '-safe', '0', '-i', input_file]
+    return ['-i', input_file]
+
+
+def _concat_format(info: dict) -> tuple:
+    return info.get('codec'), info.get('sample_rate'), info.get('channels')
+
+
+def _probe_concat_info(list_file: str) -> dict:
+    """Media info of a concat list, combined from its (cached) member probes.
+
+    The concat demuxer takes the stream parameters of the first member for
+    the whole timeline, so every member must have the same audio codec,
+    sample rate and channel count.
+    """
+    try:
+        members = concat_members(list_file)
+    except OSError as e:
+        return {'error': str(e)}
+    if not members:
+        return {'error': f"No recordings listed in {os.path.basename(list_file)}"}
+    infos = []
+    for path in members:
+        info = get_audio_info(path)
+        if 'error' in info:
+            return {'error': f"{os.path.basename(path)}: {info['error']}"}
+        if infos and _concat_format(info) != _concat_format(infos[0]):
+            return {'error': (
+                f"{os.path.basename(path)} ({info['codec']}, {info['sample_rate']} Hz, "
+                f"{info['channels']} ch) does not match {os.path.basename(members[0])} "
+                f"({infos[0]['codec']}, {infos[0]['sample_rate']} Hz, {infos[0]['channels']} ch); "
+                f"only recordings in the same audio format can be joined"
+            )}
+        infos.append(info)
+
+    duration = sum(info['duration'] for info in infos)
+    size = sum(info['size'] for info in infos)
+    # Duration-weighted, so a short trailing segment does not skew the estimate
+    bitrate = int(sum(info['bitrate'] * info['duration'] for info in infos) / duration) if duration else 0
+    return {
+        'duration': duration,
+        'duration_str': format_duration(duration),
+        'size': size,
+        'size_str': format_size(size),
+        'bitrate': bitrate,
+        'codec': infos[0]['codec'],
+        'sample_rate': infos[0]['sample_rate'],
+        'channels': infos[0]['channels'],
+        'is_video': any(info['is_video'] for info in infos),
+        'inputs': len(infos),
+    }
+
+
+def _concat_dir() -> str:
+    path = os.path.join(get_cache_dir(), 'concat')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def natural_sort_key(path: str) -> list:
+    """Sort key that orders numbered files by value: zoom_2 before zoom_10"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', path)]
+
+
+def make_concat_input(files: List[str]) -> str:
+    """Join recordings, in the given order, into one input for splitting.
+
+    Writes a small concat list into the cache (named after the first
+    recording, so parts and the output folder are named after it too) and
+    returns its path; a single file is returned unchanged. Each member's
+    duration is written into the list so seeking to a cut opens only the
+    member that holds it. Raises if a file is missing or the recordings do
+    not share an audio format.
+    """
+    files = [os.path.abspath(f) for f in files]
+    if not files:
+        raise ValueError("No input files")
+    if len(files) == 1:
+        return files[0]
+    keys = []
+    for path in files:
+        key = _file_cache_key(path)
+        if key is None:
+            raise Exception(f"Input file not found: {path}")
+        keys.append(key)
+
+    # One folder per member set (path, size, mtime): an unchanged list is reused as-is
+    stem = hashlib.sha1("\n".join(keys).encode('utf-8')).hexdigest()[:16]
+    folder = os.path.join(_concat_dir(), stem)
+    list_file = os.path.join(folder, os.path.splitext(os.path.basename(files[0]))[0] + CONCAT_EXTENSION)
+    if not os.path.exists(list_file):
+        lines = ["ffconcat version 1.0"]
+        for path in files:
+            info = get_audio_info(path)
+            if 'error' in info:
+                raise Exception(f"Failed to read file: {info['error']}")
+            lines.append(f"file {_concat_quote(path)}")
+            if info.get('duration'):
+                lines.append(f"duration {info['duration']:.6f}")
+        os.makedirs(folder, exist_ok=True)
+        tmp_path = f"{list_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, list_file)
+
+    info = get_audio_info(list_file)
+    if 'error' in info:
+        raise Exception(info['error'])
+    return list_file
+
+
+
+# ============================================================================
+# AUDIO INTERMEDIATES (video inputs)
+# ============================================================================
+# Container extensions for stream-copying an audio codec out of a video
+_COPY_CONTAINERS = {
+    'aac': '.m4a', 'alac': '.m4a', 'mp3': '.mp3', 'flac': '.flac',
+    'opus': '.opus', 'vorbis': '.ogg', 'ac3': '.ac3', 'eac3': '.eac3',
+}
+# FFmpeg muxer that writes each of those containers
+_CONTAINER_MUXERS = {
+    '.m4a': 'ipod', '.mp3': 'mp3', '.flac': 'flac', '.opus': 'opus',
+    '.ogg': 'ogg', '.ac3': 'ac3', '.eac3': 'eac3',
+}
+# Total size of extracted audio kept in the cache before the oldest is evicted
+AUDIO_CACHE_BUDGET = 2 * 1024 ** 3
+
+_audio_cache_lock = threading.Lock()
+# Intermediates that splits and analyses in this process are reading (path -> users)
+_audio_in_use: Dict[str, int] = {}
+
+
+def _audio_cache_dir() -> str:
+    path = os.path.join(get_cache_dir(), 'audio')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _trim_audio_cache(keep: str, budget: int = AUDIO_CACHE_BUDGET):
+    """Evict least recently used intermediates until the cache fits the budget.
+
+    Files in use by another job are never evicted (call with _audio_cache_lock held).
+    """
+    entries = []
+    for name in os.listdir(_audio_cache_dir()):
+        path = os.path.join(_audio_cache_dir(), name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= budget:
+            break
+        if path == keep or path in _audio_in_use:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def get_audio_intermediate(input_file: str, info: dict,
+                           progress_callback: Optional[Callable[[str], None]] = None,
+                           cancel: Optional[CancelToken] = None, pin: bool = False) -> str:
+    """Extract the audio track of a video once and return the cached audio file.
+
+    The track is stream-copied when its codec fits a plain audio container,
+    otherwise re-encoded losslessly to FLAC. The file is keyed on the video's
+    path, size and mtime, so every part encode and later re-split reads the
+    small audio file instead of demuxing the whole video again. With pin,
+    the file is marked in use (see _audio_source) before it is returned.
+    """
+    key = _file_cache_key(input_file)
+    if key is None:
+        raise Exception(f"Failed to read file: {input_file}")
+    stem = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+    cache_dir = _audio_cache_dir()
+
+    with _audio_cache_lock:
+        for ext in set(_COPY_CONTAINERS.values()) | {'.flac'}:
+            path = os.path.join(cache_dir, stem + ext)
+            if os.path.exists(path):
+                os.utime(path)  # mark as recently used
+                if pin:
+                    _audio_in_use[path] = _audio_in_use.get(path, 0) + 1
+                return path
+
+    if progress_callback:
+        progress_callback("Extracting audio track...")
+
+    ext = _COPY_CONTAINERS.get(info.get('codec'))
+    attempts = [(ext, ['-c:a', 'copy'])] if ext and ffmpeg_supports('muxers', _CONTAINER_MUXERS[ext]) else []
+    attempts.append(('.flac', ['-c:a', 'flac']))
+    error = None
+    for ext, codec in attempts:
+        path = os.path.join(cache_dir, stem + ext)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+        cmd = [get_ffmpeg_path()] + _input_args(input_file) + ['-map', '0:a:0', '-vn', '-sn', '-dn']
+        cmd.extend(codec + ['-y', tmp_path])
+        try:
+            _run_ffmpeg(cmd, "FFmpeg audio extraction error", cancel=cancel)
+            os.replace(tmp_path, path)
+        except SplitCancelled:
+            _remove_files([tmp_path])
+            raise
+        except Exception as e:
+            _remove_files([tmp_path])
+            error = e
+            continue
+        with _audio_cache_lock:
+            if pin:
+                _audio_in_use[path] = _audio_in_use.get(path, 0) + 1
+            _trim_audio_cache(keep=path)
+        return path
+    raise error
+
+
+@contextmanager
+def _audio_source(input_file: str, info: dict, use_intermediate: bool = True,
+                  progress_callback: Optional[Callable[[str], None]] = None,
+                  cancel: Optional[CancelToken] = None):
+    """File to read a job's audio from: the cached intermediate of a video, else the input.
+
+    The intermediate is kept out of cache eviction until the block exits, so
+    another job's extraction cannot delete it while parts are still cut from it.
+    """
+    if not (use_intermediate and is_video_file(input_file)):
+        yield input_file
+        return
+    path = get_audio_intermediate(input_file, info, progress_callback, cancel, pin=True)
+    try:
+        yield path
+    finally:
+        with _audio_cache_lock:
+            _audio_in_use[path] -= 1
+            if not _audio_in_use[path]:
+                del _audio_in_use[path]
+
+
+# ============================================================================
+# SILENCE ANALYSIS
+# ============================================================================
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_DURATION = 0.4
+# Default distance (seconds) a cut may move to land in a pause
+SILENCE_TOLERANCE = 30.0
+
+_silence_cache = DiskCache('silence_cache.json', max_entries=64)
+_SILENCE_RE = re.compile(r'silence_(start|end): (-?[\d.]+)')
+
+
+def detect_silences(
+    input_file: str,
+    info: Optional[dict] = None,
+    noise_db: float = SILENCE_NOISE_DB,
+    min_duration: float = SILENCE_MIN_DURATION,
+    use_intermediate: bool = True,
+    cancel: Optional[CancelToken] = None
+) -> List[List[float]]:
+    """Find quiet regions as [start, end] pairs in one streaming FFmpeg pass.
+
+    Runs the silencedetect filter and parses its log while FFmpeg decodes,
+    so nothing but the result is kept in memory. Results are cached on disk
+    per input (path, size, mtime) and thresholds, so planning a different
+    number of parts never re-analyzes the file.
+    """
+    file_key = _file_cache_key(input_file)
+    key = f"{file_key}|{noise_db}|{min_duration}" if file_key else None
+    if key:
+        cached = _silence_cache.get(key)
+        if cached is not None:
+            return cached
+
+    if info is None:
+        info = get_audio_info(input_file)
+    if 'error' in info:
+        raise Exception(f"Failed to read file: {info['error']}")
+    silences = []
+    start = None
+
+    def on_stderr(line: str):
+        nonlocal start
+        for kind, value in _SILENCE_RE.findall(line):
+            if kind == 'start':
+                start = max(0.0, float(value))
+            elif start is not None:
+                silences.append([round(start, 3), round(float(value), 3)])
+                start = None
+
+    with _audio_source(input_file, info, use_intermediate, cancel=cancel) as source:
+        # -progress only keeps the stall watchdog fed during long stretches of speech
+        cmd = [
+            get_ffmpeg_path(), '-nostdin', '-nostats', '-v', 'info', '-progress', 'pipe:1',
+            *_input_args(source), '-map', '0:a:0', '-vn',
+            '-af', f'silencedetect=noise={noise_db}dB:d={min_duration}',
+            '-f', 'null', '-'
+        ]
+        with tracer.span('ffmpeg', 'process') as span:
+            _trace_ffmpeg_io(span, cmd)
+            run_process(cmd, "FFmpeg silence analysis error", on_stdout=lambda line: None,
+                        on_stderr=on_stderr, stall_timeout=STALL_TIMEOUT, cancel=cancel, span=span)
+    if start is not None:
+        # Silence that runs to the end of the file
+        silences.append([round(start, 3), round(info.get('duration', start), 3)])
+
+    if key:
+        _silence_cache.put(key, silences)
+    return silences
+
+
+# ============================================================================
+# WAVEFORM (optional: needs NumPy)
+# ============================================================================
+# Envelope resolution (bins across the whole file) and the PCM rate decoded for it
+WAVEFORM_BINS = 1000
+WAVEFORM_SAMPLE_RATE = 8000
+# Bytes of PCM processed per NumPy reduction
+_WAVEFORM_CHUNK = 1024 * 1024
+
+_waveform_cache = DiskCache('waveform_cache.json', max_entries=64)
+
+
+def waveform_available() -> bool:
+    """Whether NumPy is installed (the waveform preview is skipped without it)"""
+    import importlib.util
+    return importlib.util.find_spec('numpy') is not None
+
+
+def compute_waveform(
+    input_file: str,
+    info: Optional[dict] = None,
+    bins: int = WAVEFORM_BINS,
+    use_intermediate: bool = True,
+    cancel: Optional[CancelToken] = None
+) -> dict:
+    """Peak and RMS envelopes of a file, `bins` values each in the 0-1 range.
+
+    FFmpeg decodes a mono, downsampled 16-bit PCM stream into a pipe and
+    each chunk is reduced with vectorized NumPy operations as it arrives,
+    so memory use stays at one chunk however long the recording is. The
+    envelope is cached on disk next to the probe data, keyed on the input
+    (path, size, mtime) and bin count. Returns {'duration', 'peak', 'rms'}.
+    """
+    import numpy as np
+
+    file_key = _file_cache_key(input_file)
+    key = f"{file_key}|{bins}" if file_key else None
+    if key:
+        cached = _waveform_cache.get(key)
+        if cached is not None:
+            return cached
+
+    if info is None:
+        info = get_audio_info(input_file)
+    if 'error' in info:
+        raise Exception(f"Failed to read file: {info['error']}")
+    # Samples per bin from the probed duration; a short or missing duration
+    # only makes the last bins empty
+    per_bin = max(1, math.ceil(info.get('duration', 0) * WAVEFORM_SAMPLE_RATE / bins))
+    block = per_bin * 2 * max(1, _WAVEFORM_CHUNK // (per_bin * 2))
+    peaks, rms = [], []
+
+    def reduce(data: bytes):
+        samples = np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768.0
+        full = len(samples) // per_bin * per_bin
+        blocks = [samples[:full].reshape(-1, per_bin)] if full else []
+        if full < len(samples):
+            blocks.append(samples[full:].reshape(1, -1))  # final partial bin
+        for b in blocks:
+            peaks.extend(np.abs(b).max(axis=1).tolist())
+            rms.extend(np.sqrt(np.mean(b * b, axis=1)).tolist())
+
+    pending = [b'']
+
+    def on_chunk(data: bytes):
+        # read() returns whole blocks until the end of the stream
+        data = pending[0] + data
+        usable = len(data) // block * block
+        if usable:
+            reduce(data[:usable])
+        pending[0] = data[usable:]
+
+    with _audio_source(input_file, info, use_intermediate, cancel=cancel) as source:
+        cmd = [
+            get_ffmpeg_path(), '-nostdin', '-v', 'error',
+            *_input_args(source), '-map', '0:a:0', '-vn',
+            '-ac', '1', '-ar', str(WAVEFORM_SAMPLE_RATE),
+            '-f', 's16le', '-acodec', 'pcm_s16le', 'pipe:1'
+        ]
+        with tracer.span('ffmpeg', 'process') as span:
+            _trace_ffmpeg_io(span, cmd)
+            run_process(cmd, "FFmpeg waveform error", on_stdout=on_chunk, chunk_size=block,
+                        stall_timeout=STALL_TIMEOUT, cancel=cancel, span=span)
+    if pending[0]:
+        reduce(pending[0][:len(pending[0]) // 2 * 2])
+
+    # Pad (or trim) to exactly `bins` values
+    peaks = (peaks + [0.0] * bins)[:bins]
+    rms = (rms + [0.0] * bins)[:bins]
+    waveform = {
+        'duration': info.get('duration', 0),
+        'peak': [round(v, 4) for v in peaks],
+        'rms': [round(v, 4) for v in rms],
+    }
+    if key:
+        _waveform_cache.put(key, waveform)
+    return waveform
+
+
+# ============================================================================
+# SPLITTING
+# ============================================================================
+SPLIT_ENGINES = ('auto', 'segment', 'per_part', 'parallel')
+# Seconds decoded before each cut after the fast input-side seek
+SEEK_PREROLL = 5.0
+# Upper bound for automatically chosen part counts
+MAX_PARTS = 500
+# Fraction of a size limit that planned parts may fill
+SIZE_SAFETY = 0.97
+
+
+def plan_boundaries(
+    total_duration: float,
+    num_parts: int,
+    silences: Optional[List[List[float]]] = None,
+    tolerance: float = 0.0
+) -> List[float]:
+    """Plan the parts: returns num_parts + 1 cut times from 0 to total_duration.
+
+    Cuts are equally spaced. With `silences` (see detect_silences) each cut
+    moves to the middle of the nearest quiet region whose middle is within
+    `tolerance` seconds of the equal cut; cuts without one stay put.
+    """
+    if num_parts < 1:
+        raise ValueError("num_parts must be at least 1")
+    part_duration = total_duration / num_parts
+    cuts = [i * part_duration for i in range(num_parts)] + [total_duration]
+    if not silences or tolerance <= 0:
+        return cuts
+
+    middles = sorted((start + end) / 2 for start, end in silences)
+    for i in range(1, num_parts):
+        ideal = cuts[i]
+        j = bisect.bisect_left(middles, ideal)
+        candidates = [m for m in middles[max(0, j - 1):j + 1] if abs(m - ideal) <= tolerance]
+        if candidates:
+            best = min(candidates, key=lambda m: abs(m - ideal))
+            # Keep cuts strictly increasing and every part at least a second long
+            if cuts[i - 1] + 1.0 < best < total_duration - 1.0:
+                cuts[i] = best
+    return cuts
+
+
+# Output profiles: part file extension, encoder (None = MP3, see _mp3_encoder_args),
+# default bitrate (0 = keep the source quality) and extra FFmpeg output arguments.
+# The speech profiles downmix to mono and resample to 16 kHz, which is all a
+# transcription service uses, at a fraction of the size and encode time.
+OUTPUT_PROFILES = {
+    'standard': {'ext': '.mp3', 'encoder': None, 'bitrate': 0, 'args': []},
+    'speech': {'ext': '.mp3', 'encoder': None, 'bitrate': 32, 'args': ['-ac', '1', '-ar', '16000']},
+    'speech_opus': {'ext': '.opus', 'encoder': 'libopus', 'bitrate': 24,
+                    'args': ['-ac', '1', '-ar', '16000', '-application', 'voip']},
+}
+
+
+def profile_supported(profile: str) -> bool:
+    """Whether the FFmpeg build can write this output profile (see ffmpeg_supports)"""
+    encoder = OUTPUT_PROFILES[profile]['encoder']
+    muxer = _CONTAINER_MUXERS[OUTPUT_PROFILES[profile]['ext']]
+    return (encoder is None or ffmpeg_supports('encoders', encoder)) and ffmpeg_supports('muxers', muxer)
+
+
+def effective_bitrate(input_file: str, info: dict, bitrate: int, profile: str = 'standard') -> int:
+    """Output bitrate (kbps) that split_audio produces for these settings"""
+    if bitrate > 0:
+        return bitrate
+    if OUTPUT_PROFILES[profile]['bitrate']:
+        return OUTPUT_PROFILES[profile]['bitrate']
+    copy = _is_mp3_audio(input_file)
+    kbps = info.get('bitrate') or 192
+    # MP3 tops out at 320 kbps when re-encoding
+    return kbps if copy else min(kbps, 320)
+
+
+def estimate_size(duration: float, kbps: int) -> int:
+    """Predicted size in bytes of `duration` seconds of audio at `kbps`"""
+    return int(duration * kbps * 1000 / 8)
+
+
+def choose_num_parts(
+    total_duration: float,
+    kbps: int,
+    max_part_duration: Optional[float] = None,
+    max_part_size: Optional[int] = None,
+    silences: Optional[List[List[float]]] = None,
+    tolerance: float = 0.0,
+    min_parts: int = 1
+) -> int:
+    """Smallest part count whose planned parts all fit the duration/size limits.
+
+    Starts from the count implied by the totals and adds parts until every
+    planned part (including cuts moved to pauses) fits, so the first split
+    is already short enough. Sizes keep a small margin for VBR and headers.
+    Raises ValueError for a limit that is zero or negative.
+    """
+    if max_part_duration is not None and max_part_duration <= 0:
+        raise ValueError(f"max_part_duration must be positive, got {max_part_duration}")
+    if max_part_size is not None and max_part_size <= 0:
+        raise ValueError(f"max_part_size must be positive, got {max_part_size}")
+    n = max(1, min_parts)
+    if max_part_duration:
+        n = max(n, math.ceil(total_duration / max_part_duration))
+    if max_part_size:
+        n = max(n, math.ceil(estimate_size(total_duration, kbps) / (max_part_size * SIZE_SAFETY)))
+    while n < MAX_PARTS:
+        cuts = plan_boundaries(total_duration, n, silences, tolerance)
+        longest = max(b - a for a, b in zip(cuts, cuts[1:]))
+        fits_duration = not max_part_duration or longest <= max_part_duration
+        fits_size = not max_part_size or estimate_size(longest, kbps) <= max_part_size * SIZE_SAFETY
+        if fits_duration and fits_size:
+            break
+        n += 1
+    return n
+
+
+def _is_mp3_audio(input_file: str) -> bool:
+    """Whether every recording of an input is an MP3 file (so parts can be stream copied)"""
+    return all(os.path.splitext(f)[1].lower() == '.mp3' for f in input_files(input_file))
+
+
+def default_output_dir(input_file: str, base_dir: Optional[str] = None) -> str:
+    """Get the dedicated `{base}_split` folder for an input file.
+
+    For a concat list the folder goes next to its first recording.
+    """
+    base_dir = base_dir or os.path.dirname(os.path.abspath(input_files(input_file)[0]))
+    base_name = os.path.splitext(os.path.basename(input_file))[0]
+    return os.path.join(base_dir, f"{base_name}_split")
+
+
+# MP3 encoders in order of preference; FFmpeg uses libmp3lame by default
+_MP3_ENCODERS = ['libmp3lame', 'mp3_mf', 'mp3_at', 'libshine']
+
+
+def _mp3_encoder_args() -> List[str]:
+    """Explicit encoder for FFmpeg builds without libmp3lame (empty when the default works)"""
+    if ffmpeg_supports('encoders', 'libmp3lame'):
+        return []
+    for name in _MP3_ENCODERS[1:]:
+        if ffmpeg_supports('encoders', name):
+            return ['-c:a', name]
+    raise Exception("This FFmpeg build cannot encode MP3 (libmp3lame is missing)")
+
+
+def _audio_codec_args(input_file: str, info: dict, bitrate: int, profile: str = 'standard') -> List[str]:
+    """Build the FFmpeg output arguments for the chosen quality (re-encode or stream copy)"""
+    args = []
+    is_video = any(is_video_file(f) for f in input_files(input_file))
+
+    # Strip video if input is a video file
+    if is_video:
+        args.extend(['-vn'])
+
+    settings = OUTPUT_PROFILES[profile]
+    if profile != 'standard':
+        if settings['encoder'] and not ffmpeg_supports('encoders', settings['encoder']):
+            raise Exception(f"This FFmpeg build cannot encode {profile} output ({settings['encoder']} is missing)")
+        encoder = ['-c:a', settings['encoder']] if settings['encoder'] else _mp3_encoder_args()
+        kbps = effective_bitrate(input_file, info, bitrate, profile)
+        return args + encoder + ['-b:a', f'{kbps}k'] + settings['args']
+
+    if bitrate > 0:
+        args.extend(_mp3_encoder_args() + ['-b:a', f'{bitrate}k'])
+    elif not _is_mp3_audio(input_file):
+        fallback = f"{info['bitrate']}k" if info.get('bitrate') else '192k'
+        args.extend(_mp3_encoder_args() + ['-b:a', fallback])
+    else:
+        args.extend(['-acodec', 'copy'])
+    return args
+
+
+def _part_path(output_dir: str, base_name: str, index: int, ext: str = '.mp3') -> str:
+    """Path of the 1-based part number `index` inside output_dir"""
+    return os.path.join(output_dir, f"{base_name}_part{index}{ext}")
+
+
+def _seek_args(start_time: float, duration: Optional[float] = None) -> tuple:
+    """Split a seek into a fast input-side jump and an accurate output-side trim.
+
+    Putting -ss after -i makes FFmpeg decode and discard everything before
+    the cut, so total work grows quadratically with the part count. Instead
+    we seek the demuxer to SEEK_PREROLL seconds before the cut (cheap, via
+    the container index) and trim the short remainder after decoding.
+    Returns (input_args, output_args).
+    """
+    coarse = max(0.0, start_time - SEEK_PREROLL)
+    fine = start_time - coarse
+    input_args = ['-ss', f'{coarse:.6f}'] if coarse > 0 else []
+    output_args = ['-ss', f'{fine:.6f}'] if fine > 0 else []
+    if duration is not None:
+        output_args.extend(['-t', f'{duration:.6f}'])
+    return input_args, output_args
+
+
+def _remove_files(paths: List[str]):
+    """Best-effort removal of (possibly partial) output files"""
+    for path in paths:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except Exception:
+            pass
+
+
+def _remove_parts(output_files: List[str], indices, extra_outputs: Optional[List[tuple]] = None):
+    """Remove the given parts (0-based) from the output folder and every extra_outputs folder"""
+    folders = [os.path.dirname(output_files[0])] if output_files else []
+    folders += [folder for folder, _ in extra_outputs or []]
+    _remove_files([os.path.join(folder, os.path.basename(output_files[i]))
+                   for folder in folders for i in indices])
+
+
+def _part_command(
+    input_file: str,
+    output_file: str,
+    boundaries: List[float],
+    index: int,
+    codec_args: List[str],
+    extra_outputs: Optional[List[tuple]] = None
+) -> List[str]:
+    """Build the FFmpeg command that encodes the 0-based part `index`.
+
+    extra_outputs: (folder, codec_args) pairs for more variants of the same
+    part, written by the same process from the same decode.
+    """
+    start = boundaries[index]
+    is_last = index == len(boundaries) - 2
+    input_seek, output_trim = _seek_args(
+        start, None if is_last else boundaries[index + 1] - start)
+    cmd = [get_ffmpeg_path()]
+    cmd.extend(input_seek)
+    cmd.extend(_input_args(input_file))
+    cmd.extend(output_trim)
+    cmd.extend(codec_args)
+    cmd.extend(['-y', output_file])
+    for folder, args in extra_outputs or []:
+        cmd.extend(output_trim + args + [os.path.join(folder, os.path.basename(output_file))])
+    return cmd
+
+
+class EncodeProgress:
+    """Turn FFmpeg -progress samples into throttled, fine-grained progress reports.
+
+    callback receives a dict with 'processed' and 'total' (seconds of media),
+    'fraction' (0-1), 'speed' (x realtime, smoothed) and 'eta' (seconds, or
+    None while unknown). It is called at most once per `interval` seconds,
+    plus once more from finish(). Safe to update from several threads.
+    """
+    def __init__(self, total: float, callback: Optional[Callable[[dict], None]],
+                 interval: float = 0.25):
+        self.total = total
+        self.callback = callback
+        self.interval = interval
+        self.processed = 0.0
+        self.speed = 0.0
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._last_time = self._started_at
+        self._last_processed = 0.0
+
+    def update(self, processed: float):
+        with self._lock:
+            self.processed = min(max(processed, 0.0), self.total)
+            now = time.monotonic()
+            if self.callback is None or now - self._last_time < self.interval:
+                return
+            rate = (self.processed - self._last_processed) / (now - self._last_time)
+            self.speed = rate if not self.speed else 0.3 * rate + 0.7 * self.speed
+            self._last_time = now
+            self._last_processed = self.processed
+            report = self._report()
+        self.callback(report)
+
+    def finish(self):
+        with self._lock:
+            self.processed = self.total
+            elapsed = time.monotonic() - self._started_at
+            self.speed = self.total / elapsed if elapsed > 0 else 0.0
+            report = self._report()
+        if self.callback:
+            self.callback(report)
+
+    def _report(self) -> dict:
+        remaining = self.total - self.processed
+        return {
+            'processed': self.processed,
+            'total': self.total,
+            'fraction': self.processed / self.total if self.total else 0.0,
+            'speed': self.speed,
+            'eta': remaining / self.speed if self.speed > 0 else None,
+        }
+
+
+def _run_ffmpeg(cmd: List[str], error_prefix: str,
+                on_progress: Optional[Callable[[float], None]] = None,
+                outputs: Optional[List[str]] = None,
+                cancel: Optional[CancelToken] = None):
+    """Run an FFmpeg command, feeding its -progress output time (seconds) to on_progress.
+
+    Runs through run_process: stderr is kept only as a short tail for the
+    error message, a stalled FFmpeg is killed and `cancel` stops it. `outputs`
+    lists the files written when that is not simply the last argument (for
+    tracing).
+    """
+    cmd = [cmd[0], '-nostdin', '-nostats', '-progress', 'pipe:1'] + cmd[1:]
+
+    def on_stdout(raw: bytes):
+        key, _, value = raw.decode(errors='replace').strip().partition('=')
+        if key == 'out_time_us' and on_progress:
+            try:
+                on_progress(int(value) / 1_000_000)
+            except ValueError:
+                pass  # "N/A" before the first frame
+
+    with tracer.span('ffmpeg', 'process') as span:
+        try:
+            run_process(cmd, error_prefix, on_stdout=on_stdout, stall_timeout=STALL_TIMEOUT,
+                        cancel=cancel, span=span)
+        finally:
+            _trace_ffmpeg_io(span, cmd, outputs)
+
+
+def _split_per_part(
+    input_file: str,
+    output_dir: str,
+    base_name: str,
+    boundaries: List[float],
+    codec_args: List[str],
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    tracker: Optional[EncodeProgress] = None,
+    indices: Optional[List[int]] = None,
+    part_done: Optional[Callable[[int], None]] = None,
+    extra_outputs: Optional[List[tuple]] = None,
+    cancel: Optional[CancelToken] = None,
+    ext: str = '.mp3'
+) -> List[str]:
+    """Encode each part with its own FFmpeg process (one decode per part).
+
+    Only the 0-based parts in `indices` are encoded (default: all);
+    part_done(i) is called as soon as part i is complete on disk.
+    extra_outputs adds variants to every process (see _part_command).
+    If a part fails or the job is cancelled, the outputs of the unfinished
+    parts are removed.
+    """
+    num_parts = len(boundaries) - 1
+    indices = list(range(num_parts)) if indices is None else list(indices)
+    output_files = [_part_path(output_dir, base_name, i + 1, ext) for i in range(num_parts)]
+
+    completed = set()
+    try:
+        for i in indices:
+            if progress_callback:
+                progress_callback(i + 1, num_parts, f"Processing part {i + 1} of {num_parts}...")
+
+            cmd = _part_command(input_file, output_files[i], boundaries, i, codec_args, extra_outputs)
+            on_progress = (lambda t, start=boundaries[i]: tracker.update(start + t)) if tracker else None
+            _run_ffmpeg(cmd, f"FFmpeg error on part {i+1}", on_progress, cancel=cancel)
+            completed.add(i)
+            if part_done:
+                part_done(i)
+    except BaseException:
+        _remove_parts(output_files, [i for i in indices if i not in completed], extra_outputs)
+        raise
+
+    return output_files
+
+
+def _split_parallel(
+    input_file: str,
+    output_dir: str,
+    base_name: str,
+    boundaries: List[float],
+    codec_args: List[str],
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    tracker: Optional[EncodeProgress] = None,
+    indices: Optional[List[int]] = None,
+    part_done: Optional[Callable[[int], None]] = None,
+    workers: Optional[int] = None,
+    extra_outputs: Optional[List[tuple]] = None,
+    cancel: Optional[CancelToken] = None,
+    ext: str = '.mp3'
+) -> List[str]:
+    """Encode parts concurrently, one FFmpeg process each, in a bounded pool.
+
+    progress_callback reports the number of finished parts across all
+    workers. If any part fails or the job is cancelled, running FFmpeg
+    processes are killed, queued parts are skipped and the partial outputs
+    of unfinished parts are removed.
+    """
+    num_parts = len(boundaries) - 1
+    indices = list(range(num_parts)) if indices is None else list(indices)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(indices)))
+    output_files = [_part_path(output_dir, base_name, i + 1, ext) for i in range(num_parts)]
+
+    # Stops the other workers on the first failure without cancelling the caller's token
+    stop = cancel.child() if cancel else CancelToken()
+    progress_lock = threading.Lock()
+    finished = [num_parts - len(indices)]
+    completed = set()
+    # Media seconds encoded so far, per part, summed for aggregate progress;
+    # parts that are not being encoded count as already done
+    processed = [0.0 if i in indices else boundaries[i + 1] - boundaries[i] for i in range(num_parts)]
+
+    def on_progress(i: int, seconds: float):
+        processed[i] = seconds
+        tracker.update(sum(processed))
+
+    def encode(i: int):
+        if stop.cancelled:
+            raise SplitCancelled("Cancelled")
+        cmd = _part_command(input_file, output_files[i], boundaries, i, codec_args, extra_outputs)
+        _run_ffmpeg(cmd, f"FFmpeg error on part {i+1}",
+                    (lambda seconds: on_progress(i, seconds)) if tracker else None, cancel=stop)
+
+        if part_done:
+            part_done(i)
+        with progress_lock:
+            completed.add(i)
+            finished[0] += 1
+            if progress_callback:
+                progress_callback(finished[0], num_parts,
+                                  f"Finished {finished[0]} of {num_parts} parts...")
+
+    if progress_callback:
+        progress_callback(finished[0], num_parts, f"Processing {len(indices)} parts on {workers} workers...")
+
+    error = None
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(encode, i) for i in indices]
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            exc = future.exception()
+            if exc is not None and error is None:
+                error = exc
+                for f in futures:
+                    f.cancel()
+                stop.cancel()
+
+    if cancel and cancel.cancelled:
+        error = SplitCancelled("Cancelled")
+    if error is not None:
+        _remove_parts(output_files, [i for i in indices if i not in completed], extra_outputs)
+        raise error
+
+    return output_files
+
+
+def _split_segmented(
+    input_file: str,
+    output_dir: str,
+    base_name: str,
+    boundaries: List[float],
+    codec_args: List[str],
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    tracker: Optional[EncodeProgress] = None,
+    part_done: Optional[Callable[[int], None]] = None,
+    extra_outputs: Optional[List[tuple]] = None,
+    cancel: Optional[CancelToken] = None,
+    ext: str = '.mp3'
+) -> List[str]:
+    """Produce all parts from a single decode using FFmpeg's segment muxer.
+
+    The encoder's output time, compared against the planned boundaries,
+    drives the same per-part progress_callback as the per-part engine. A
+    part is reported to part_done once the muxer has opened the next one.
+    extra_outputs, (folder, codec_args) pairs, adds more segmented variants
+    written by the same process from the same decode. If FFmpeg fails or
+    the job is cancelled, the parts not yet reported to part_done are removed.
+    """
+    num_parts = len(boundaries) - 1
+    output_files = [_part_path(output_dir, base_name, i + 1, ext) for i in range(num_parts)]
+
+    def segment_output(folder: str, args: List[str]) -> List[str]:
+        # The segment muxer expands printf-style patterns, so escape literal '%'
+        pattern = os.path.join(folder, f"{base_name.replace('%', '%%')}_part%d{ext}")
+        out = ['-vn'] + [a for a in args if a != '-vn']
+        out.extend([
+            '-f', 'segment',
+            '-segment_format', _CONTAINER_MUXERS[ext],
+            '-segment_start_number', '1',
+            '-reset_timestamps', '1',
+        ])
+        if num_parts > 1:
+            cut_points = ",".join(f"{t:.6f}" for t in boundaries[1:-1])
+            out.extend(['-segment_times', cut_points])
+        return out + ['-y', pattern]
+
+    cmd = [get_ffmpeg_path()] + _input_args(input_file)
+    cmd.extend(segment_output(output_dir, codec_args))
+    for folder, args in extra_outputs or []:
+        cmd.extend(segment_output(folder, args))
+
+    if progress_callback:
+        progress_callback(1, num_parts, f"Processing part 1 of {num_parts}...")
+
+    current = [0]
+
+    def on_progress(seconds: float):
+        if tracker:
+            tracker.update(seconds)
+        part = min(bisect.bisect_right(boundaries, seconds) - 1, num_parts - 1)
+        # The segment muxer closes a part before it opens the next file
+        while current[0] < part and os.path.exists(output_files[current[0] + 1]):
+            if part_done:
+                part_done(current[0])
+            current[0] += 1
+            if progress_callback:
+                progress_callback(current[0] + 1, num_parts,
+                                  f"Processing part {current[0] + 1} of {num_parts}...")
+
+    extra_files = [os.path.join(folder, os.path.basename(f))
+                   for folder, _ in extra_outputs or [] for f in output_files]
+    try:
+        _run_ffmpeg(cmd, "FFmpeg segment error", on_progress, outputs=output_files + extra_files,
+                    cancel=cancel)
+
+        missing = [f for f in output_files + extra_files if not os.path.exists(f)]
+        if missing:
+            raise Exception(f"FFmpeg segment error: {len(missing)} of {len(output_files + extra_files)} "
+                            f"parts were not written")
+    except BaseException:
+        _remove_parts(output_files, range(current[0], num_parts), extra_outputs)
+        raise
+    if part_done:
+        for i in range(current[0], num_parts):
+            part_done(i)
+
+    return output_files
+
+
+MANIFEST_NAME = '.dropthemike-manifest.json'
+
+
+def _file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Bytes read from each of the head, middle and tail of a file for its fingerprint
+FINGERPRINT_WINDOW = 1024 * 1024
+
+_fingerprint_cache = DiskCache('fingerprints.json', max_entries=512)
+
+
+def _read_at(f, offset: int, size: int) -> bytes:
+    """Read `size` bytes at `offset` without moving the file position (where supported)"""
+    if not hasattr(os, 'pread'):
+        f.seek(offset)
+        return f.read(size)
+    chunks = []
+    while size > 0:
+        chunk = os.pread(f.fileno(), size, offset)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        offset += len(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _sampled_fingerprint(path: str, duration: float) -> str:
+    """SHA-256 over size, duration and three FINGERPRINT_WINDOW blocks of the file"""
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(f"{size}|{duration:.3f}|".encode('utf-8'))
+    with open(path, 'rb') as f:
+        if size <= 3 * FINGERPRINT_WINDOW:
+            digest.update(_read_at(f, 0, size))  # small file: all of it
+        else:
+            for offset in (0, (size - FINGERPRINT_WINDOW) // 2, size - FINGERPRINT_WINDOW):
+                digest.update(_read_at(f, offset, FINGERPRINT_WINDOW))
+    return f"sample1:{digest.hexdigest()}"
+
+
+def input_fingerprint(input_file: str, info: Optional[dict] = None) -> str:
+    """Content fingerprint of an input file, independent of its path.
+
+    Reads only the head, middle and tail blocks (3 MB in all), whatever the
+    file size, and mixes in the size and the container duration, so a
+    multi-GB video is identified in milliseconds. Files of the same size and
+    duration that differ only outside those blocks get the same
+    fingerprint, so it only finds candidates: the result cache confirms a
+    hit with input_content_hash before reusing parts. Memoized on disk per
+    path, size and mtime. benchmarks/bench_fingerprint.py compares it with
+    hashing the whole file.
+    """
+    key = _file_cache_key(input_file)
+    cached = _fingerprint_cache.get(key) if key else None
+    if cached is not None:
+        return cached
+    if is_concat_list(input_file):
+        # The same recordings in the same order, wherever the list lives
+        members = "|".join(input_fingerprint(f) for f in concat_members(input_file))
+        fingerprint = f"concat1:{hashlib.sha256(members.encode('utf-8')).hexdigest()}"
+        if key:
+            _fingerprint_cache.put(key, fingerprint)
+        return fingerprint
+    if info is None:
+        info = get_audio_info(input_file)
+    with tracer.span('fingerprint', 'disk', file=input_file):
+        fingerprint = _sampled_fingerprint(input_file, info.get('duration') or 0.0)
+    if key:
+        _fingerprint_cache.put(key, fingerprint)
+    return fingerprint
+
+
+_content_hash_cache = DiskCache('content_hashes.json', max_entries=512)
+
+
+def input_content_hash(input_file: str) -> str:
+    """SHA-256 of the whole input (of every member, in order, for a concat list).
+
+    Reads the entire file, so it is only computed to confirm a result-cache
+    candidate made from another file; memoized on disk per path, size and
+    mtime.
+    """
+    key = _file_cache_key(input_file)
+    cached = _content_hash_cache.get(key) if key else None
+    if cached is not None:
+        return cached
+    if is_concat_list(input_file):
+        members = "|".join(input_content_hash(f) for f in concat_members(input_file))
+        digest = f"concat1:{hashlib.sha256(members.encode('utf-8')).hexdigest()}"
+    else:
+        with tracer.span('content_hash', 'disk', file=input_file):
+            digest = _file_sha256(input_file)
+    if key:
+        _content_hash_cache.put(key, digest)
+    return digest
+
+
+class SplitManifest:
+    """Per-job record in the {base}_split folder that makes splits resumable.
+
+    Stores the job parameters, the input fingerprint and, for every part, its
+    boundaries and completion state with size and checksum. Opening the
+    manifest for a job with different parameters (or a changed input)
+    starts it over; otherwise finished parts are kept.
+    """
+    def __init__(self, output_dir: str, job: dict, parts: List[dict]):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.job = job
+        self.parts = parts
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, output_dir: str, input_file: str, info: dict, base_name: str,
+             boundaries: List[float], codec_args: List[str], ext: str = '.mp3') -> 'SplitManifest':
+        """Load the manifest for this job, or create a fresh one"""
+        st = os.stat(input_file)
+        job = {
+            'version': 1,
+            'input': {
+                'path': os.path.abspath(input_file),
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'duration': info.get('duration', 0),
+            },
+            'num_parts': len(boundaries) - 1,
+            'codec_args': codec_args,
+        }
+        if is_concat_list(input_file):
+            # The list file stays the same when one of its recordings changes
+            job['input']['members'] = _file_cache_key(input_file)
+        parts = [{
+            'index': i + 1,
+            'file': os.path.basename(_part_path(output_dir, base_name, i + 1, ext)),
+            'start': round(boundaries[i], 6),
+            'end': round(boundaries[i + 1], 6),
+            'status': 'pending',
+            'size': None,
+            'sha256': None,
+        } for i in range(len(boundaries) - 1)]
+        # Normalize through JSON so the comparison with a stored job is exact
+        job = json.loads(json.dumps(job))
+
+        try:
+            with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            same_bounds = [(p['file'], p['start'], p['end']) for p in stored['parts']] == \
+                          [(p['file'], p['start'], p['end']) for p in parts]
+            if stored.get('job') == job and same_bounds:
+                parts = stored['parts']
+        except Exception:
+            pass
+
+        manifest = cls(output_dir, job, parts)
+        manifest.save()
+        return manifest
+
+    def pending(self) -> List[int]:
+        """0-based parts that still need encoding: not done, missing or corrupt"""
+        todo = []
+        for i, part in enumerate(self.parts):
+            path = os.path.join(self.output_dir, part['file'])
+            ok = (part['status'] == 'done'
+                  and os.path.exists(path)
+                  and os.path.getsize(path) == part['size']
+                  and _file_sha256(path) == part['sha256'])
+            if not ok:
+                if part['status'] == 'done':
+                    part.update(status='pending', size=None, sha256=None)
+                todo.append(i)
+        self.save()
+        return todo
+
+    def mark_done(self, index: int):
+        """Record the 0-based part `index` as complete, with size and checksum"""
+        path = os.path.join(self.output_dir, self.parts[index]['file'])
+        size, sha256 = os.path.getsize(path), _file_sha256(path)
+        with self._lock:
+            self.parts[index].update(status='done', size=size, sha256=sha256)
+            self.save()
+
+    def save(self):
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'job': self.job, 'parts': self.parts}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+_output_dir_locks: Dict[str, threading.Lock] = {}
+_output_dir_locks_guard = threading.Lock()
+
+
+@contextmanager
+def exclusive_output_dir(output_dir: str, cancel: Optional[CancelToken] = None,
+                         on_wait: Optional[Callable[[], None]] = None):
+    """Let one job at a time (in this process) write into an output folder.
+
+    Jobs for the same recording with different settings share the
+    {base}_split folder and would overwrite each other's parts and manifest,
+    so a second job waits (cancellably; on_wait is called once if it has
+    to) until the first is finished.
+    """
+    key = os.path.normcase(os.path.abspath(output_dir))
+    with _output_dir_locks_guard:
+        lock = _output_dir_locks.setdefault(key, threading.Lock())
+    if not lock.acquire(blocking=False):
+        if on_wait:
+            on_wait()
+        while not lock.acquire(timeout=0.2):
+            if cancel is not None and cancel.cancelled:
+                raise SplitCancelled("Cancelled")
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+# Disk space the result cache may use before least recently used entries are evicted
+RESULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+
+def _link_or_copy(src: str, dst: str):
+    """Hardlink src to dst (replacing dst), or copy it where links are not possible"""
+    _remove_files([dst])
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+class ResultCache:
+    """Content-addressed store of finished splits, shared by every output folder.
+
+    An entry is keyed on the input's content fingerprint (input_fingerprint)
+    and the split parameters: part count, boundaries and codec arguments
+    (which carry the bitrate). The sampled fingerprint can collide, so an
+    entry also records which file it was made from: it is reused as-is for
+    that same unchanged file, and for any other file only when the full
+    SHA-256 of both (input_content_hash) match. Full hashes are computed on
+    such a candidate hit, never after a plain split. On a hit the parts are hardlinked
+    (or copied) into the output folder instead of being encoded again. Entries live in
+    the cache directory; once they add up to more than max_bytes the least
+    recently used are evicted. With verify=True every part is checked
+    against its stored SHA-256 before reuse; sizes are always checked.
+    """
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES, verify: bool = True):
+        self.max_bytes = max_bytes
+        self.verify = verify
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> str:
+        return os.path.join(get_cache_dir(), 'results')
+
+    @staticmethod
+    def key(fingerprint: str, boundaries: List[float], codec_args: List[str]) -> str:
+        job = {
+            'input': fingerprint,
+            'num_parts': len(boundaries) - 1,
+            'boundaries': [round(t, 6) for t in boundaries],
+            'codec_args': codec_args,
+        }
+        return hashlib.sha256(json.dumps(job, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _read_entry(self, key: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.root, key, 'entry.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _write_entry(self, folder: str, entry: dict):
+        tmp_path = os.path.join(folder, 'entry.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, os.path.join(folder, 'entry.json'))
+
+    def _same_input(self, key: str, entry: dict, input_file: str) -> bool:
+        """Whether a candidate entry was made from the content of input_file"""
+        source = entry.get('input') or {}
+        if source.get('key') and source['key'] == _file_cache_key(input_file):
+            return True  # the very file it was made from, unchanged
+        expected = entry.get('input_sha256')
+        if expected is None:
+            if not source or _file_cache_key(source['path']) != source['key']:
+                self.discard(key)  # the original changed or is gone: nothing to confirm against
+                return False
+            expected = entry['input_sha256'] = input_content_hash(source['path'])
+            try:
+                self._write_entry(os.path.join(self.root, key), entry)
+            except OSError:
+                pass
+        return expected == input_content_hash(input_file)
+
+    def fetch(self, key: str, targets: Dict[int, str], input_file: str) -> bool:
+        """Place the cached parts {0-based index: output path}; False on a miss"""
+        entry = self._read_entry(key)
+        if entry is None:
+            return False
+        if not self._same_input(key, entry, input_file):
+            return False  # another recording with the same fingerprint
+        folder = os.path.join(self.root, key)
+        sources = {}
+        try:
+            for i in targets:
+                record = entry['files'][i]
+                path = os.path.join(folder, record['name'])
+                if os.path.getsize(path) != record['size'] or \
+                        (self.verify and _file_sha256(path) != record['sha256']):
+                    raise ValueError(f"{path} does not match its checksum")
+                sources[i] = path
+        except Exception:
+            self.discard(key)  # damaged or incomplete: encode again
+            return False
+        for i, path in targets.items():
+            _link_or_copy(sources[i], path)
+        try:
+            entry['last_used'] = time.time()
+            self._write_entry(folder, entry)
+        except OSError:
+            pass
+        return True
+
+    def store(self, key: str, files: List[str], input_file: str):
+        """Add a finished split (every part, in order) and evict down to max_bytes"""
+        sizes = [os.path.getsize(path) for path in files]
+        if sum(sizes) > self.max_bytes:
+            return
+        with self._lock:
+            folder = os.path.join(self.root, key)
+            if os.path.exists(folder):
+                return
+            tmp_folder = os.path.join(self.root, f".tmp-{key}-{os.getpid()}-{threading.get_ident()}")
+            try:
+                os.makedirs(tmp_folder)
+                records = []
+                for i, (path, size) in enumerate(zip(files, sizes)):
+                    name = f"part{i + 1}{os.path.splitext(path)[1]}"
+                    _link_or_copy(path, os.path.join(tmp_folder, name))
+                    records.append({'name': name, 'size': size, 'sha256': _file_sha256(path)})
+                now = time.time()
+                source_key = _file_cache_key(input_file)
+                self._write_entry(tmp_folder, {
+                    'files': records, 'size': sum(sizes),
+                    'input': {'path': os.path.abspath(input_file), 'key': source_key},
+                    # Free when already known; otherwise hashed on the first candidate hit
+                    'input_sha256': _content_hash_cache.get(source_key) if source_key else None,
+                    'created': now, 'last_used': now,
+                })
+                os.rename(tmp_folder, folder)
+                self._evict()
+            except Exception:
+                shutil.rmtree(tmp_folder, ignore_errors=True)  # caching is best effort
+
+    def discard(self, key: str):
+        shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.root):
+            entry = None if name.startswith('.') else self._read_entry(name)
+            if entry is not None:
+                entries.append((entry.get('last_used', 0), entry.get('size', 0), name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.discard(name)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+result_cache = ResultCache()
+
+
+def _plan_split(input_file: str, info: dict, num_parts: int, bitrate: int, use_intermediate: bool,
+                silence_tolerance: float, max_part_duration: Optional[float],
+                max_part_size: Optional[int], cancel: Optional[CancelToken] = None,
+                profile: str = 'standard') -> List[float]:
+    """Cut times for a split, with the options documented in split_audio"""
+    with tracer.span('plan'):
+        silences = None
+        # Builds without silencedetect fall back to even cuts
+        if silence_tolerance > 0 and ffmpeg_supports('filters', 'silencedetect'):
+            silences = detect_silences(input_file, info, use_intermediate=use_intermediate, cancel=cancel)
+        if max_part_duration or max_part_size:
+            num_parts = choose_num_parts(
+                info['duration'], effective_bitrate(input_file, info, bitrate, profile),
+                max_part_duration, max_part_size, silences, silence_tolerance, min_parts=num_parts
+            )
+        return plan_boundaries(info['duration'], num_parts, silences, silence_tolerance)
+
+
+def split_audio(
+    input_file: str,
+    output_dir: str,
+    num_parts: int,
+    bitrate: int,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    engine: str = 'auto',
+    workers: Optional[int] = None,
+    detail_callback: Optional[Callable[[dict], None]] = None,
+    detail_interval: float = 0.25,
+    resume: bool = True,
+    use_intermediate: bool = True,
+    silence_tolerance: float = 0.0,
+    boundaries: Optional[List[float]] = None,
+    max_part_duration: Optional[float] = None,
+    max_part_size: Optional[int] = None,
+    cancel: Optional[CancelToken] = None,
+    use_cache: bool = True,
+    profile: str = 'standard'
+) -> List[str]:
+    """Split audio/video file into equal MP3 parts.
+
+    engine: 'segment' decodes the input once and cuts every part in a single
+    FFmpeg process, 'per_part' runs one FFmpeg process per part, 'parallel'
+    runs the per-part processes concurrently on up to `workers` processes
+    (default: CPU count), and 'auto' uses 'segment' when the FFmpeg build has
+    the segment muxer (see get_ffmpeg_capabilities) and falls back to
+    'per_part' if it is missing or fails.
+
+    detail_callback receives fine-grained encode progress read from FFmpeg's
+    -progress stream (see EncodeProgress), at most once per detail_interval
+    seconds.
+
+    With resume=True a manifest in output_dir records each finished part, so
+    rerunning the same job only encodes parts that are missing or corrupt.
+
+    With use_intermediate=True the audio of a video input is extracted once
+    (see get_audio_intermediate) and all parts are cut from that file.
+
+    silence_tolerance > 0 moves each cut to the nearest pause within that
+    many seconds (see plan_boundaries). Explicit `boundaries` (num_parts + 1
+    cut times) override planning altogether.
+
+    max_part_duration (seconds) and/or max_part_size (bytes) pick the
+    smallest part count, at least num_parts, whose parts all fit (see
+    choose_num_parts); the returned list tells how many parts were made.
+
+    cancel.cancel() from another thread stops every FFmpeg process of the
+    job and raises SplitCancelled; parts already finished stay in the
+    manifest and are reused by the next run.
+
+    With use_cache=True a split of the same content with the same cut times
+    and codec settings, made earlier from any folder, is reused from
+    result_cache instead of being encoded again (see ResultCache).
+
+    profile picks an entry of OUTPUT_PROFILES: 'speech' writes mono 16 kHz
+    MP3 and 'speech_opus' mono 16 kHz Opus (.opus parts), each at a low
+    default bitrate when bitrate is 0.
+
+    With the tracer enabled, planning, manifest I/O, every FFmpeg run and
+    every callback invocation are recorded as spans (see Tracer).
+    """
+    if engine not in SPLIT_ENGINES:
+        raise ValueError(f"Unknown split engine: {engine}")
+    if profile not in OUTPUT_PROFILES:
+        raise ValueError(f"Unknown output profile: {profile}")
+
+    progress_callback = tracer.wrap(progress_callback, 'progress_callback')
+    detail_callback = tracer.wrap(detail_callback, 'detail_callback')
+    with tracer.span('split_audio', file=input_file, engine=engine) as span:
+        info = get_audio_info(input_file)
+        if 'error' in info:
+            raise Exception(f"Failed to read file: {info['error']}")
+
+        if boundaries is None:
+            boundaries = _plan_split(input_file, info, num_parts, bitrate, use_intermediate,
+                                     silence_tolerance, max_part_duration, max_part_size, cancel, profile)
+            num_parts = len(boundaries) - 1
+        elif len(boundaries) != num_parts + 1:
+            raise ValueError("boundaries must hold num_parts + 1 cut times")
+
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = os.path.splitext(os.path.basename(input_file))[0]
+        codec_args = _audio_codec_args(input_file, info, bitrate, profile)
+        ext = OUTPUT_PROFILES[profile]['ext']
+        tracker = EncodeProgress(info['duration'], detail_callback, detail_interval) if detail_callback else None
+        output_files = [_part_path(output_dir, base_name, i + 1, ext) for i in range(num_parts)]
+
+        with tracer.span('manifest', 'disk'):
+            manifest = SplitManifest.open(output_dir, input_file, info, base_name, boundaries, codec_args, ext) \
+                if resume else None
+            todo = manifest.pending() if manifest else list(range(num_parts))
+        part_done = tracer.wrap(manifest.mark_done, 'mark_done', 'disk') if manifest else None
+        span.update(num_parts=num_parts, todo=len(todo))
+
+        cache_key = None
+        if use_cache and todo:
+            with tracer.span('result_cache', 'disk') as cache_span:
+                cache_key = result_cache.key(input_fingerprint(input_file, info), boundaries, codec_args)
+                hit = result_cache.fetch(cache_key, {i: output_files[i] for i in todo}, input_file)
+                cache_span['hit'] = hit
+            if hit:
+                for i in todo:
+                    if part_done:
+                        part_done(i)
+                todo = []
+                cache_key = None  # nothing new to store
+        # Encode into fresh files: a pending part may be a hardlink into the result cache
+        _remove_files([output_files[i] for i in todo])
+
+        extract_progress = (lambda message: progress_callback(0, num_parts, message)) \
+            if progress_callback else None
+        with _audio_source(input_file, info, bool(todo) and use_intermediate, extract_progress, cancel) as source:
+            args = (source, output_dir, base_name, boundaries, codec_args, progress_callback, tracker)
+            if engine == 'auto' and not ffmpeg_supports('muxers', 'segment'):
+                engine = 'per_part'  # Known in advance: no need to try the segment muxer first
+
+            options = {'part_done': part_done, 'cancel': cancel, 'ext': ext}
+
+            if not todo:
+                pass  # Every part is already complete and verified
+            elif len(todo) < num_parts:
+                # Resuming: encode only the missing or corrupt parts
+                if engine == 'parallel':
+                    _split_parallel(*args, indices=todo, workers=workers, **options)
+                else:
+                    _split_per_part(*args, indices=todo, **options)
+            elif engine == 'per_part':
+                _split_per_part(*args, **options)
+            elif engine == 'segment':
+                _split_segmented(*args, **options)
+            elif engine == 'parallel':
+                _split_parallel(*args, workers=workers, **options)
+            else:
+                try:
+                    _split_segmented(*args, **options)
+                except SplitCancelled:
+                    raise
+                except Exception:
+                    # Older/limited FFmpeg builds: drop unfinished parts and redo them one by one
+                    todo = manifest.pending() if manifest else list(range(num_parts))
+                    _remove_files([output_files[i] for i in todo])
+                    _split_per_part(*args, indices=todo, **options)
+
+        if cache_key:
+            with tracer.span('result_cache_store', 'disk'):
+                result_cache.store(cache_key, output_files, input_file)
+        if tracker:
+            tracker.finish()
+        if progress_callback:
+            progress_callback(num_parts, num_parts, "Complete!")
+
+        return output_files
+
+
+def variant_dir_name(bitrate: int) -> str:
+    """Subfolder of the split folder that holds one quality variant"""
+    return 'original' if bitrate <= 0 else f'{bitrate}kbps'
+
+
+def split_audio_variants(
+    input_file: str,
+    output_dir: str,
+    num_parts: int,
+    bitrates: List[int],
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    engine: str = 'auto',
+    workers: Optional[int] = None,
+    detail_callback: Optional[Callable[[dict], None]] = None,
+    detail_interval: float = 0.25,
+    use_intermediate: bool = True,
+    silence_tolerance: float = 0.0,
+    boundaries: Optional[List[float]] = None,
+    max_part_duration: Optional[float] = None,
+    max_part_size: Optional[int] = None,
+    cancel: Optional[CancelToken] = None,
+    profile: str = 'standard'
+) -> Dict[int, List[str]]:
+    """Split a file into the same parts at several qualities from one decode.
+
+    Each bitrate (0 keeps the original quality, as in split_audio) gets its
+    own subfolder of output_dir named by variant_dir_name. Every FFmpeg
+    process writes all variants: the 'segment' engine produces everything
+    from a single decode of the source, 'per_part' and 'parallel' decode
+    each part once for all variants. A size limit applies to the largest
+    variant. Variants are not tracked by a resume manifest. Returns the
+    part files per bitrate. `cancel` and `profile` (applied to every
+    variant) work as in split_audio; with a speech profile bitrate 0 means
+    the profile's default bitrate and is returned under that key.
+    """
+    if engine not in SPLIT_ENGINES:
+        raise ValueError(f"Unknown split engine: {engine}")
+    if profile not in OUTPUT_PROFILES:
+        raise ValueError(f"Unknown output profile: {profile}")
+    default = OUTPUT_PROFILES.get(profile, {}).get('bitrate')
+    if default:
+        bitrates = [b if b > 0 else default for b in bitrates]  # no "original" for speech
+    bitrates = list(dict.fromkeys(bitrates))
+    if not bitrates:
+        raise ValueError("At least one bitrate is required")
+
+    progress_callback = tracer.wrap(progress_callback, 'progress_callback')
+    detail_callback = tracer.wrap(detail_callback, 'detail_callback')
+    with tracer.span('split_audio_variants', file=input_file, engine=engine, bitrates=bitrates):
+        info = get_audio_info(input_file)
+        if 'error' in info:
+            raise Exception(f"Failed to read file: {info['error']}")
+
+        if boundaries is None:
+            largest = max(bitrates, key=lambda b: effective_bitrate(input_file, info, b, profile))
+            boundaries = _plan_split(input_file, info, num_parts, largest, use_intermediate,
+                                     silence_tolerance, max_part_duration, max_part_size, cancel, profile)
+            num_parts = len(boundaries) - 1
+        elif len(boundaries) != num_parts + 1:
+            raise ValueError("boundaries must hold num_parts + 1 cut times")
+
+        base_name = os.path.splitext(os.path.basename(input_file))[0]
+        folders = [os.path.join(output_dir, variant_dir_name(b)) for b in bitrates]
+        for folder in folders:
+            os.makedirs(folder, exist_ok=True)
+        codec_args = [_audio_codec_args(input_file, info, b, profile) for b in bitrates]
+        ext = OUTPUT_PROFILES[profile]['ext']
+        extra_outputs = list(zip(folders[1:], codec_args[1:]))
+        tracker = EncodeProgress(info['duration'], detail_callback, detail_interval) if detail_callback else None
+
+        extract_progress = (lambda message: progress_callback(0, num_parts, message)) \
+            if progress_callback else None
+        with _audio_source(input_file, info, use_intermediate, extract_progress, cancel) as source:
+            args = (source, folders[0], base_name, boundaries, codec_args[0], progress_callback, tracker)
+            if engine == 'auto' and not ffmpeg_supports('muxers', 'segment'):
+                engine = 'per_part'
+
+            options = {'extra_outputs': extra_outputs, 'cancel': cancel, 'ext': ext}
+
+            if engine == 'per_part':
+                _split_per_part(*args, **options)
+            elif engine == 'segment':
+                _split_segmented(*args, **options)
+            elif engine == 'parallel':
+                _split_parallel(*args, workers=workers, **options)
+            else:
+                try:
+                    _split_segmented(*args, **options)
+                except SplitCancelled:
+                    raise
+                except Exception:
+                    _split_per_part(*args, **options)
+
+        if tracker:
+            tracker.finish()
+        if progress_callback:
+            progress_callback(num_parts, num_parts, "Complete!")
+
+        return {b: [_part_path(folder, base_name, i + 1, ext) for i in range(num_parts)]
+                for b, folder in zip(bitrates, folders)}
+
+
+# ============================================================================
+# BATCH QUEUE
+# ============================================================================
+def is_media_file(file_path: str) -> bool:
+    """Check if a file has a supported audio, video or concat list extension"""
+    ext = os.path.splitext(file_path)[1].lower()
+    return ext in AUDIO_EXTENSIONS or ext in VIDEO_EXTENSIONS or ext == CONCAT_EXTENSION
+
+
+def find_media_files(directory: str, recursive: bool = False) -> List[str]:
+    """List supported audio/video files in a directory, sorted by path"""
+    found = []
+    if recursive:
+        for root, dirs, files in os.walk(directory):
+            # Never descend into our own output folders
+            dirs[:] = [d for d in dirs if not d.endswith('_split')]
+            found.extend(os.path.join(root, f) for f in files if is_media_file(f))
+    else:
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path) and is_media_file(name):
+                found.append(path)
+    return sorted(found)
+
+
+class BatchJob:
+    """One file in a batch queue, with its settings, state and progress.
+
+    split_options holds extra keyword arguments for split_audio.
+    """
+    def __init__(self, input_file: str, output_dir: str, num_parts: int, bitrate: int,
+                 split_options: Optional[dict] = None):
+        self.input_file = input_file
+        self.output_dir = output_dir
+        self.num_parts = num_parts
+        self.bitrate = bitrate
+        self.split_options = dict(split_options or {})
+        self.status = 'queued'  # queued | running | done | error | cancelled
+        self.progress = 0.0
+        self.message = ''
+        self.output_files: List[str] = []
+        self.error: Optional[str] = None
+        self.duration = 0.0
+        self.size = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.duplicate_of: Optional[str] = None
+        self.cancel_token = CancelToken()
+        self._finished = threading.Event()
+
+    def cancel(self):
+        """Stop this job: a queued job never starts, a running one kills its FFmpeg processes"""
+        self.cancel_token.cancel()
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def to_dict(self) -> dict:
+        return {
+            'input': self.input_file,
+            'output_dir': self.output_dir,
+            'num_parts': self.num_parts,
+            'bitrate': self.bitrate,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'parts': self.output_files,
+            'error': self.error,
+            'duration': self.duration,
+            'elapsed': self.elapsed,
+            'duplicate_of': self.duplicate_of,
+        }
+
+
+class BatchScheduler:
+    """Split many files concurrently under a global worker budget.
+
+    Every running file occupies one worker: the default single-decode engine
+    runs one FFmpeg process per file, so `workers` bounds the number of
+    FFmpeg processes. With the parallel engine each running file gets an equal
+    share of the CPU cores for its own pool (unless the job sets `workers`).
+    Jobs start in the order they were added. A failed file
+    is recorded on its job and never stops the rest of the queue.
+    on_update(job) is called from worker threads whenever a job changes.
+
+    Identical recordings (same input_fingerprint) with the same settings are
+    encoded once: a copy waits for the first one and then takes its parts
+    from result_cache. Its job records the original in duplicate_of.
+    """
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        on_update: Optional[Callable[[BatchJob], None]] = None,
+        engine: str = 'auto'
+    ):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.on_update = on_update
+        self.engine = engine
+        self.jobs: List[BatchJob] = []
+        self._futures = []
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='batch')
+        self._by_content: Dict[tuple, BatchJob] = {}
+        self._started_at: Optional[float] = None
+
+    def add(self, input_file: str, num_parts: int, bitrate: int,
+            output_base_dir: Optional[str] = None, **split_options) -> BatchJob:
+        """Queue one file; its parts go to the usual {name}_split folder"""
+        job = BatchJob(input_file, default_output_dir(input_file, output_base_dir),
+                       num_parts, bitrate, split_options)
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+            self.jobs.append(job)
+            self._futures.append(self._pool.submit(self._run, job))
+        self._notify(job)
+        return job
+
+    def add_directory(self, directory: str, num_parts: int, bitrate: int,
+                      output_base_dir: Optional[str] = None, recursive: bool = False,
+                      **split_options) -> List[BatchJob]:
+        """Queue every supported audio/video file in a directory"""
+        return [self.add(path, num_parts, bitrate, output_base_dir, **split_options)
+                for path in find_media_files(directory, recursive)]
+
+    def _notify(self, job: BatchJob):
+        if self.on_update:
+            try:
+                self.on_update(job)
+            except Exception:
+                pass
+
+    def _run(self, job: BatchJob):
+        try:
+            self._run_job(job)
+        finally:
+            job._finished.set()
+
+    def _wait_for_duplicate(self, job: BatchJob, info: dict):
+        """Block while an identical recording with the same settings is being split.
+
+        Raises SplitCancelled if the job is cancelled while it waits.
+        """
+        if 'error' in info or not job.split_options.get('use_cache', True):
+            return
+        key = (input_fingerprint(job.input_file, info), job.num_parts, job.bitrate,
+               json.dumps(job.split_options, sort_keys=True, default=str))
+        with self._lock:
+            original = self._by_content.setdefault(key, job)
+        if original is job:
+            return
+        job.duplicate_of = original.input_file
+        job.message = f"Same recording as {os.path.basename(original.input_file)}"
+        self._notify(job)
+        # Poll so a cancel (no FFmpeg process to kill yet) ends the wait promptly
+        while not original._finished.wait(0.2):
+            if job.cancel_token.cancelled:
+                raise SplitCancelled("Cancelled")
+
+    def _run_job(self, job: BatchJob):
+        if job.cancel_token.cancelled:
+            job.status = 'cancelled'
+            self._notify(job)
+            return
+        job.status = 'running'
+        job.started_at = time.monotonic()
+        self._notify(job)
+
+        def progress_callback(current, total, message):
+            job.progress = current / total if total else 0.0
+            job.message = message
+            self._notify(job)
+
+        try:
+            info = get_audio_info(job.input_file)
+            job.duration = info.get('duration', 0.0)
+            job.size = info.get('size', 0)
+            self._wait_for_duplicate(job, info)
+            with exclusive_output_dir(job.output_dir, job.cancel_token,
+                                      lambda: progress_callback(0, 1, "Waiting for the output folder...")):
+                if job.cancel_token.cancelled:
+                    # A result-cache hit starts no process that would notice the cancel
+                    raise SplitCancelled("Cancelled")
+                options = dict(job.split_options)
+                if self.workers > 1:
+                    options.setdefault('workers', max(1, (os.cpu_count() or 1) // self.workers))
+                job.output_files = split_audio(
+                    job.input_file, job.output_dir, job.num_parts, job.bitrate,
+                    progress_callback, engine=self.engine, cancel=job.cancel_token, **options
+                )
+            job.status = 'done'
+            job.progress = 1.0
+        except SplitCancelled:
+            job.status = 'cancelled'
+        except Exception as e:
+            job.status = 'error'
+            job.error = str(e)
+        job.finished_at = time.monotonic()
+        self._notify(job)
+
+    def stats(self) -> dict:
+        """Overall progress and throughput of the queue"""
+        with self._lock:
+            jobs = list(self.jobs)
+            started_at = self._started_at
+        counts = {s: 0 for s in ('queued', 'running', 'done', 'error', 'cancelled')}
+        for job in jobs:
+            counts[job.status] += 1
+        finished = [j for j in jobs if j.status == 'done']
+        media_seconds = sum(j.duration for j in finished)
+        media_bytes = sum(j.size for j in finished)
+        elapsed = time.monotonic() - started_at if started_at is not None else 0.0
+        return {
+            'total': len(jobs),
+            **counts,
+            'progress': sum(j.progress for j in jobs) / len(jobs) if jobs else 0.0,
+            'elapsed': elapsed,
+            'media_seconds': media_seconds,
+            'speed': media_seconds / elapsed if elapsed > 0 else 0.0,
+            'files_per_minute': 60 * len(finished) / elapsed if elapsed > 0 else 0.0,
+            'bytes_per_second': media_bytes / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def is_idle(self) -> bool:
+        with self._lock:
+            return all(f.done() for f in self._futures)
+
+    def wait(self):
+        """Block until every queued job has finished"""
+        while True:
+            with self._lock:
+                futures = list(self._futures)
+            for future in futures:
+                try:
+                    future.result()
+                except Exception:
+                    pass
+            with self._lock:
+                if len(self._futures) == len(futures):
+                    return
+
+    def shutdown(self, cancel_pending: bool = True, cancel_running: bool = False):
+        """Stop accepting jobs; queued jobs are marked cancelled unless cancel_pending=False.
+
+        cancel_running=True also stops the files being split right now.
+        """
+        with self._lock:
+            jobs = list(self.jobs)
+            futures = list(self._futures)
+        if cancel_pending:
+            for job, future in zip(jobs, futures):
+                if future.cancel():
+                    job.status = 'cancelled'
+                    self._notify(job)
+        if cancel_running:
+            for job in jobs:
+                job.cancel()
+        self._pool.shutdown(wait=False)
+
+
+# ============================================================================
+# WATCH FOLDERS
+# ============================================================================
+WATCH_STATE_NAME = 'watch_state.json'
+
+
+class FolderWatcher:
+    """Splits recordings that appear in watched folders once they are fully written.
+
+    Folders are rescanned every poll_interval seconds. When the optional
+    `watchdog` package is installed, file system events (inotify, FSEvents,
+    ReadDirectoryChangesW) trigger a rescan right away and idle folders are
+    polled only every idle_interval seconds. A new or changed file is split
+    once its size and mtime have not changed for `settle` seconds; files go
+    through a BatchScheduler, so `workers` bounds concurrent splits.
+
+    Every finished file is recorded (path, size, mtime, outcome) in a JSON
+    state file, by default in the cache directory, so a restart only picks
+    up files that are new or were modified since. A file that failed is
+    retried only after it changes.
+    """
+    def __init__(
+        self,
+        folders: List[str],
+        num_parts: int,
+        bitrate: int,
+        output_base_dir: Optional[str] = None,
+        recursive: bool = False,
+        workers: Optional[int] = None,
+        settle: float = 5.0,
+        poll_interval: float = 2.0,
+        idle_interval: float = 60.0,
+        state_path: Optional[str] = None,
+        on_update: Optional[Callable[[BatchJob], None]] = None,
+        **split_options
+    ):
+        self.folders = [os.path.abspath(f) for f in folders]
+        self.num_parts = num_parts
+        self.bitrate = bitrate
+        self.output_base_dir = output_base_dir
+        self.recursive = recursive
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.idle_interval = idle_interval
+        self.state_path = state_path or os.path.join(get_cache_dir(), WATCH_STATE_NAME)
+        self.on_update = on_update
+        self.split_options = split_options
+        self.scheduler = BatchScheduler(workers=workers, on_update=self._job_update)
+        # Reentrant: the scheduler reports a newly added job while scan() holds it
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pending: Dict[str, tuple] = {}  # path -> (size, mtime_ns, unchanged since)
+        self._submitted: Dict[int, tuple] = {}  # id(job) -> (path, size, mtime_ns) until it ends
+        self._state = self._load_state()
+
+    def _load_state(self) -> Dict[str, dict]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)['files']
+        except Exception:
+            return {}
+
+    def _save_state(self):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'files': self._state}, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _is_done(self, path: str, size: int, mtime_ns: int) -> bool:
+        entry = self._state.get(path)
+        return entry is not None and entry['size'] == size and entry['mtime_ns'] == mtime_ns
+
+    def scan(self) -> List[BatchJob]:
+        """Check the folders once and queue every file that has settled"""
+        now = time.monotonic()
+        queued = []
+        for folder in self.folders:
+            try:
+                paths = find_media_files(folder, self.recursive)
+            except OSError:
+                continue  # folder missing or unreachable for now; try again next time
+            for path in paths:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                stamp = (st.st_size, st.st_mtime_ns)
+                with self._lock:
+                    if self._is_done(path, *stamp) or self._is_active(path):
+                        # A file changed while its job runs is picked up again afterwards
+                        self._pending.pop(path, None)
+                        continue
+                    pending = self._pending.get(path)
+                    if pending is None or pending[:2] != stamp:
+                        self._pending[path] = stamp + (now,)  # new or still being written
+                        continue
+                    if st.st_size == 0 or now - pending[2] < self.settle:
+                        continue
+                    del self._pending[path]
+                    # Recorded before the lock is released, so the job cannot end unrecorded
+                    job = self.scheduler.add(path, self.num_parts, self.bitrate,
+                                             self.output_base_dir, **self.split_options)
+                    self._submitted[id(job)] = (path,) + stamp
+                queued.append(job)
+        return queued
+
+    def _is_active(self, path: str) -> bool:
+        """Whether a job for this path is still queued or running"""
+        return any(entry[0] == path for entry in self._submitted.values())
+
+    def _job_update(self, job: BatchJob):
+        if job.status in ('done', 'error'):
+            with self._lock:
+                entry = self._submitted.pop(id(job), None)
+                if entry is not None:  # None: reported again, or while scan() was still adding it
+                    path, size, mtime_ns = entry
+                    self._state[path] = {
+                        'size': size,
+                        'mtime_ns': mtime_ns,
+                        'status': job.status,
+                        'output_dir': job.output_dir,
+                        'parts': len(job.output_files),
+                        'error': job.error,
+                        'finished': time.time(),
+                    }
+                    try:
+                        self._save_state()
+                    except OSError:
+                        pass  # kept in memory; written again with the next file
+        elif job.status == 'cancelled':
+            with self._lock:
+                self._submitted.pop(id(job), None)
+        if self.on_update:
+            self.on_update(job)
+
+    def _start_observer(self):
+        """File system event observer from the optional watchdog package, or None"""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+
+        wake = self._wake
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                wake.set()
+
+        observer = Observer()
+        for folder in self.folders:
+            if os.path.isdir(folder):
+                observer.schedule(Handler(), folder, recursive=self.recursive)
+        observer.daemon = True
+        observer.start()
+        return observer
+
+    def run(self):
+        """Watch until stop() is called, then let queued and running splits finish"""
+        observer = self._start_observer()
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                self.scan()
+                with self._lock:
+                    busy = bool(self._pending)
+                self._wake.wait(self.poll_interval if busy or observer is None else self.idle_interval)
+        except BaseException:
+            # Interrupted: stop the running splits too; they resume on the next run
+            self.scheduler.shutdown(cancel_running=True)
+            raise
+        finally:
+            if observer is not None:
+                observer.stop()
+        self.scheduler.wait()
+        self.scheduler.shutdown()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+
+# ============================================================================
+# JOB ENGINE
+# ============================================================================
+class SplitRequest(NamedTuple):
+    """Immutable snapshot of one split job's settings, taken when it is submitted.
+
+    bitrates lists every quality to write (see split_audio_variants); with a
+    single bitrate the job is a plain, resumable split_audio run.
+    """
+    input_file: str
+    output_dir: str
+    num_parts: int
+    bitrates: Tuple[int, ...] = (0,)
+    engine: str = 'auto'
+    silence_tolerance: float = 0.0
+    max_part_duration: Optional[float] = None
+    max_part_size: Optional[int] = None
+    profile: str = 'standard'
+
+
+def run_split_request(
+    request: SplitRequest,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    detail_callback: Optional[Callable[[dict], None]] = None,
+    cancel: Optional[CancelToken] = None
+) -> Dict[int, List[str]]:
+    """Carry out a SplitRequest; returns the part files per bitrate"""
+    options = {
+        'engine': request.engine,
+        'detail_callback': detail_callback,
+        'silence_tolerance': request.silence_tolerance,
+        'max_part_duration': request.max_part_duration,
+        'max_part_size': request.max_part_size,
+        'cancel': cancel,
+        'profile': request.profile,
+    }
+    with exclusive_output_dir(request.output_dir, cancel):
+        if len(request.bitrates) > 1:
+            return split_audio_variants(request.input_file, request.output_dir, request.num_parts,
+                                        list(request.bitrates), progress_callback, **options)
+        files = split_audio(request.input_file, request.output_dir, request.num_parts,
+                            request.bitrates[0], progress_callback, **options)
+        return {request.bitrates[0]: files}
+
+
+class EngineJob:
+    """A SplitRequest submitted to the JobEngine, with its live state.
+
+    Worker threads write progress here as often as FFmpeg reports it;
+    snapshot() returns a consistent copy for the UI.
+    """
+    def __init__(self, request: SplitRequest):
+        self.request = request
+        self.status = 'queued'  # queued | running | done | error | cancelled
+        self.result: Optional[Dict[int, List[str]]] = None
+        self.error: Optional[str] = None
+        self.cancel_token = CancelToken()
+        self._lock = threading.Lock()
+        self._state = {'fraction': 0.0, 'message': '', 'speed': None, 'eta': None}
+        self._version = 0
+
+    def cancel(self):
+        """Stop the job; its FFmpeg processes are killed right away"""
+        self.cancel_token.cancel()
+
+    @property
+    def files(self) -> List[str]:
+        """Every file written, in bitrate order"""
+        return [f for files in (self.result or {}).values() for f in files]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {'status': self.status, 'error': self.error, **self._state}
+
+    def _update(self, **state):
+        with self._lock:
+            self._state.update(state)
+            self._version += 1
+
+
+class JobEngine:
+    """Runs split jobs from an asyncio event loop on a dedicated thread.
+
+    submit() takes an immutable SplitRequest and returns at once. Each job's
+    blocking FFmpeg work runs on a small thread pool (at most `workers` jobs
+    at a time) while a coroutine on the loop thread watches it: however
+    often FFmpeg reports progress, on_update(job) is called at most
+    max_updates_per_second times, plus once when the job finishes. Both
+    on_update and on_done are called on the loop thread, so a GUI must hand
+    them over to its own thread.
+    """
+    def __init__(self, workers: int = 1, max_updates_per_second: float = 10.0):
+        import asyncio  # only needed once the first job is submitted
+
+        self.interval = 1.0 / max_updates_per_second
+        self._loop = asyncio.new_event_loop()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='job')
+        self._jobs: List[EngineJob] = []
+        self._thread = threading.Thread(target=self._loop.run_forever, name='job-engine', daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        request: SplitRequest,
+        on_update: Optional[Callable[[EngineJob], None]] = None,
+        on_done: Optional[Callable[[EngineJob], None]] = None
+    ) -> EngineJob:
+        """Queue a job; callbacks receive the job (see class docstring)"""
+        import asyncio
+
+        job = EngineJob(request)
+        self._jobs.append(job)
+        asyncio.run_coroutine_threadsafe(self._run(job, on_update, on_done), self._loop)
+        return job
+
+    async def _run(self, job: EngineJob, on_update, on_done):
+        import asyncio
+
+        def progress_callback(current, total, message):
+            job._update(message=message)
+
+        def detail_callback(detail):
+            job._update(fraction=detail['fraction'], speed=detail['speed'], eta=detail['eta'])
+
+        def work():
+            if job.cancel_token.cancelled:
+                raise SplitCancelled("Cancelled")
+            job.status = 'running'
+            return run_split_request(job.request, progress_callback, detail_callback, job.cancel_token)
+
+        task = asyncio.ensure_future(self._loop.run_in_executor(self._pool, work))
+        seen = job._version
+        while not task.done():
+            # Coalesce: whatever happened during the interval becomes one update
+            await asyncio.wait([task], timeout=self.interval)
+            if job._version != seen and not task.done():
+                seen = job._version
+                self._notify(on_update, job)
+
+        try:
+            job.result = task.result()
+            job.status = 'done'
+            job._update(fraction=1.0)
+        except SplitCancelled:
+            job.status = 'cancelled'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'error'
+        self._jobs.remove(job)
+        self._notify(on_done, job)
+
+    @staticmethod
+    def _notify(callback, job: EngineJob):
+        if callback:
+            try:
+                callback(job)
+            except Exception:
+                pass
+
+    def shutdown(self, cancel_running: bool = True):
+        """Stop the loop thread; running jobs are cancelled unless cancel_running=False"""
+        if cancel_running:
+            for job in list(self._jobs):
+                job.cancel()
+        self._pool.shutdown(wait=False)
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,265 @@
+"""
+DROP THE MIKE - Local HTTP job server (headless, no GUI dependencies)
+
+Lets other tools on this machine submit recordings for splitting. Jobs run
+on a BatchScheduler, so at most `workers` files are split at a time.
+
+API (JSON in, JSON out):
+    POST   /jobs                {"input": path, "parts": n, "max_minutes": m, "max_mb": mb,
+                                 "bitrate": kbps, "profile": name, "output_dir": dir,
+                                 "snap_to_silence": s}
+                                "input" may also be an ordered list of paths,
+                                joined into one recording before splitting
+    GET    /jobs                every job
+    GET    /jobs/<id>           status and progress of one job
+    GET    /jobs/<id>/manifest  per-part result (start, end, size, sha256) once done
+    DELETE /jobs/<id>           cancel a queued or running job
+    GET    /health              queue statistics
+
+Usage:
+    python drop_the_mike_cli.py serve --port 8765 --workers 2
+    curl -X POST localhost:8765/jobs -d '{"input": "/data/meeting.mp4", "max_minutes": 30}'
+"""
+import json
+import os
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from drop_the_mike_core import (
+    MANIFEST_NAME, OUTPUT_PROFILES, BatchJob, BatchScheduler, is_media_file, make_concat_input,
+)
+
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Largest request body accepted (job submissions are a few hundred bytes)
+MAX_BODY_SIZE = 64 * 1024
+
+
+# ============================================================================
+# JOB SERVICE
+# ============================================================================
+class JobService:
+    """Job bookkeeping behind the HTTP API, usable without a socket.
+
+    Submissions identical to a job that is still queued or running (same
+    input file and settings) return that job instead of starting another.
+    """
+    def __init__(self, workers: Optional[int] = None, engine: str = 'auto'):
+        self.scheduler = BatchScheduler(workers=workers, engine=engine)
+        self.jobs: Dict[str, BatchJob] = {}
+        self._ids: Dict[int, str] = {}
+        self._in_flight: Dict[tuple, BatchJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, params: dict) -> Tuple[dict, bool]:
+        """Validate and queue a job; returns (job dict, whether it was deduplicated)"""
+        inputs = params.get('input')
+        if not isinstance(inputs, list) or not inputs:
+            inputs = [inputs]
+        for input_file in inputs:
+            if not isinstance(input_file, str) or not os.path.isfile(input_file):
+                raise ValueError(f"Input file not found: {input_file}")
+            if not is_media_file(input_file):
+                raise ValueError(f"Unsupported file type: {input_file}")
+        try:
+            input_file = make_concat_input(inputs)
+        except Exception as e:  # recordings that cannot be joined
+            raise ValueError(str(e))
+
+        max_minutes = _number(params, 'max_minutes')
+        if max_minutes is not None and max_minutes <= 0:
+            raise ValueError("max_minutes must be greater than 0")
+        max_mb = _number(params, 'max_mb')
+        if max_mb is not None and max_mb <= 0:
+            raise ValueError("max_mb must be greater than 0")
+        snap_to_silence = _number(params, 'snap_to_silence')
+        if snap_to_silence is not None and snap_to_silence < 0:
+            raise ValueError("snap_to_silence must not be negative (0 = off)")
+        num_parts = _integer(params, 'parts')
+        if num_parts is None:
+            num_parts = 1 if max_minutes or max_mb else 3
+        elif num_parts < 1:
+            raise ValueError("parts must be at least 1")
+        bitrate = _integer(params, 'bitrate')
+        if bitrate is None:
+            bitrate = 0
+        elif bitrate < 0:
+            raise ValueError("bitrate must not be negative (0 = original quality)")
+        output_dir = params.get('output_dir')
+        if output_dir is not None and not isinstance(output_dir, str):
+            raise ValueError("output_dir must be a string")
+        profile = params.get('profile', 'standard')
+        if not isinstance(profile, str) or profile not in OUTPUT_PROFILES:
+            raise ValueError(f"profile must be one of: {', '.join(OUTPUT_PROFILES)}")
+        options = {
+            'profile': profile,
+            'silence_tolerance': snap_to_silence or 0.0,
+            'max_part_duration': max_minutes * 60 if max_minutes else None,
+            'max_part_size': int(max_mb * 1024 * 1024) if max_mb else None,
+        }
+
+        key = (input_file, num_parts, bitrate, output_dir and os.path.abspath(output_dir),
+               tuple(sorted(options.items())))
+        with self._lock:
+            existing = self._in_flight.get(key)
+            if existing is not None and existing.status in ('queued', 'running'):
+                return self._describe(existing), True
+            job = self.scheduler.add(input_file, num_parts, bitrate, output_dir, **options)
+            job_id = uuid.uuid4().hex[:12]
+            self.jobs[job_id] = job
+            self._ids[id(job)] = job_id
+            self._in_flight[key] = job
+            return self._describe(job), False
+
+    def get(self, job_id: str) -> Optional[dict]:
+        job = self.jobs.get(job_id)
+        return self._describe(job) if job else None
+
+    def list(self) -> list:
+        with self._lock:
+            jobs = list(self.jobs.values())
+        return [self._describe(job) for job in jobs]
+
+    def manifest(self, job_id: str) -> Optional[dict]:
+        """The split folder's manifest for a finished job (None if unknown or not done).
+
+        Raises OSError or ValueError if the manifest is gone or unreadable.
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.status != 'done':
+            return None
+        with open(os.path.join(job.output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        return {'id': job_id, 'output_dir': job.output_dir, **stored}
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        job.cancel()
+        return self._describe(job)
+
+    def health(self) -> dict:
+        return {'status': 'ok', 'workers': self.scheduler.workers, **self.scheduler.stats()}
+
+    def shutdown(self):
+        self.scheduler.shutdown(cancel_running=True)
+
+    def _describe(self, job: BatchJob) -> dict:
+        return {'id': self._ids[id(job)], **job.to_dict()}
+
+
+def _number(params: dict, name: str) -> Optional[float]:
+    value = params.get(name)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} must be a number")
+    return float(value)
+
+
+def _integer(params: dict, name: str) -> Optional[int]:
+    value = _number(params, name)
+    if value is None:
+        return None
+    if not value.is_integer():
+        raise ValueError(f"{name} must be a whole number")
+    return int(value)
+
+
+# ============================================================================
+# HTTP SERVER
+# ============================================================================
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """Maps the REST routes onto the server's JobService"""
+    server_version = 'DropTheMike'
+
+    @property
+    def service(self) -> JobService:
+        return self.server.service
+
+    def do_GET(self):
+        parts = self._route()
+        if parts == ['health']:
+            return self._send(200, self.service.health())
+        if parts == ['jobs']:
+            return self._send(200, {'jobs': self.service.list()})
+        if len(parts) == 2 and parts[0] == 'jobs':
+            job = self.service.get(parts[1])
+            return self._send(200, job) if job else self._error(404, "Unknown job")
+        if len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'manifest':
+            if self.service.get(parts[1]) is None:
+                return self._error(404, "Unknown job")
+            try:
+                manifest = self.service.manifest(parts[1])
+            except (OSError, ValueError):  # output folder moved or deleted since the job finished
+                return self._error(410, "Manifest is no longer available")
+            return self._send(200, manifest) if manifest else self._error(409, "Job is not done")
+        self._error(404, "Not found")
+
+    def do_POST(self):
+        if self._route() != ['jobs']:
+            return self._error(404, "Not found")
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_SIZE:
+            return self._error(413, "Request too large")
+        try:
+            params = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(params, dict):
+                raise ValueError("Expected a JSON object")
+            job, deduplicated = self.service.submit(params)
+        except ValueError as e:  # includes malformed JSON
+            return self._error(400, str(e))
+        self._send(200 if deduplicated else 202, {**job, 'deduplicated': deduplicated})
+
+    def do_DELETE(self):
+        parts = self._route()
+        if len(parts) == 2 and parts[0] == 'jobs':
+            job = self.service.cancel(parts[1])
+            return self._send(200, job) if job else self._error(404, "Unknown job")
+        self._error(404, "Not found")
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _route(self) -> list:
+        return [p for p in self.path.split('?', 1)[0].split('/') if p]
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload, indent=2).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str):
+        self._send(status, {'error': message})
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: Optional[int] = None,
+                quiet: bool = False) -> ThreadingHTTPServer:
+    """Create (but do not start) the HTTP server; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.daemon_threads = True
+    server.service = JobService(workers)
+    server.quiet = quiet
+    return server
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: Optional[int] = None,
+          quiet: bool = False):
+    """Run the job server until interrupted; running jobs are cancelled on exit"""
+    server = make_server(host, port, workers, quiet)
+    try:
+        server.serve_forever()
+    finally:
+        server.service.shutdown()
+        server.server_close()
@@ -0,0 +1,98 @@
+"""Tests for the local job server (validation and HTTP routes; no FFmpeg needed)"""
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from drop_the_mike_core import BatchJob
+from drop_the_mike_server import JobService, make_server
+
+
+@pytest.fixture
+def recording(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    path = tmp_path / 'meeting.mp3'
+    path.write_bytes(b'\0' * 1024)
+    return str(path)
+
+
+@pytest.fixture
+def service():
+    service = JobService(workers=1)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def server(service):
+    server = make_server(port=0, quiet=True)
+    server.service.shutdown()
+    server.service = service
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _request(url, method='GET', body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize('overrides, message', [
+    ({'parts': 0}, "parts must be at least 1"),
+    ({'parts': 2.5}, "parts must be a whole number"),
+    ({'parts': True}, "parts must be a number"),
+    ({'bitrate': -64}, "bitrate must not be negative"),
+    ({'max_minutes': -5}, "max_minutes must be greater than 0"),
+    ({'max_mb': 0}, "max_mb must be greater than 0"),
+    ({'snap_to_silence': -1}, "snap_to_silence must not be negative"),
+    ({'profile': 'nope'}, "profile must be one of"),
+    ({'output_dir': 5}, "output_dir must be a string"),
+])
+def test_submit_rejects_invalid_settings(service, recording, overrides, message):
+    with pytest.raises(ValueError, match=message):
+        service.submit({'input': recording, **overrides})
+    assert service.jobs == {}
+
+
+def test_submit_rejects_missing_and_unsupported_inputs(service, recording, tmp_path):
+    with pytest.raises(ValueError, match="Input file not found"):
+        service.submit({'input': str(tmp_path / 'missing.mp3')})
+    notes = tmp_path / 'notes.txt'
+    notes.write_text('hello')
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        service.submit({'input': [recording, str(notes)]})
+
+
+def test_http_routes(server, recording):
+    status, body = _request(server + '/health')
+    assert status == 200
+    assert body['total'] == 0
+
+    status, body = _request(server + '/jobs', 'POST', {'input': recording, 'parts': 0})
+    assert status == 400
+    assert 'parts' in body['error']
+
+    assert _request(server + '/jobs/unknown')[0] == 404
+    assert _request(server + '/jobs/unknown/manifest')[0] == 404
+    assert _request(server + '/nowhere')[0] == 404
+
+
+def test_manifest_of_deleted_output_folder_is_gone(server, service, recording, tmp_path):
+    job = BatchJob(recording, str(tmp_path / 'deleted'), 2, 0)
+    job.status = 'done'
+    service.jobs['finished'] = job
+    service._ids[id(job)] = 'finished'
+
+    status, body = _request(server + '/jobs/finished/manifest')
+    assert status == 410
+    assert 'error' in body